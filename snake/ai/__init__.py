@@ -1,5 +1,8 @@
+from .telemetry import Subgoal, AITelemetry, CountingStaticEngine
 from .ai_utils import get_reach
 from .brute_force_state import State
 from .brute_force import FindPathForce
 from .astar import FindPathStatic
 from .snake_ai import SnakeAI
+from .solver import solve_level, is_solvable, MAX_SOLVE_TICKS
+from .optimizer import optimize_solution, optimize_and_index, index_states, get_state_key, is_solution, SHORTCUT_DEPTH
@@ -8,7 +8,8 @@ import ai
 
 # Only computed a couple of times per level
 class FindPathStatic(astar.AStar):
-    def __init__(self, engine: game_engine.StaticEngine, level_width: int, level_height: int):
+    def __init__(self, engine: game_engine.StaticEngine, level_width: int, level_height: int,
+                 telemetry: ai.AITelemetry | None = None):
         super().__init__()
 
         self.snake_length = 4
@@ -16,11 +17,17 @@ class FindPathStatic(astar.AStar):
         self.height = level_height
         self.engine: game_engine.StaticEngine = engine
 
+        # Counts expansions and neighbors A* already knew about (positions seen during the current search)
+        self.telemetry = telemetry
+        self.seen: set[tuple[int, int]] = set()
+
     def astar(self, start: tuple[int, int], goal: tuple[int, int], reversePath=False) -> collections.deque[tuple[int, int]]:
+        if self.telemetry:
+            self.seen = {start}
         path = super().astar(start, goal, reversePath)
 
-        # Casts to deque from list_reversegenerator
-        return collections.deque(path)
+        # Casts to deque from list_reversegenerator (the library returns None when there is no path)
+        return collections.deque(path or ())
 
     def neighbors(self, current):
         neighbors = self.get_reach(current)
@@ -31,10 +38,14 @@ class FindPathStatic(astar.AStar):
         neighbors = list(filter(lambda group: (current[0], current[1]) in group, neighbor_groups))
 
         # If there is a group of reachable blocks that the snake is in
-        if neighbors:
-            return neighbors[0]
-        else:
-            return []
+        neighbors = neighbors[0] if neighbors else []
+
+        if self.telemetry:
+            self.telemetry.current.expansions += 1
+            self.telemetry.current.node_cache_hits += sum(neighbor in self.seen for neighbor in neighbors)
+            self.seen.update(neighbors)
+
+        return neighbors
 
     def heuristic_cost_estimate(self, current, goal) -> float:
         return self.distance_between(current, goal)
@@ -51,4 +62,6 @@ class FindPathStatic(astar.AStar):
         self.snake_length = snake_length
 
     def get_reach(self, current: tuple[int, int]) -> list[tuple[int, int]]:
+        if self.telemetry:
+            self.telemetry.current.get_reach_calls += 1
         return ai.get_reach(current, self.engine, self.snake_length, self.width, self.height)
@@ -0,0 +1,165 @@
+import copy
+import typing
+
+import game_engine
+
+# The moves a solution is made of (the AI playback plays only these)
+MOVES = (game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
+         game_engine.Action.MOVE_UP, game_engine.Action.MOVE_DOWN)
+# Shortcuts are searched for with at most this many moves from every state on the path
+#  every extra move makes the search 4 times slower
+SHORTCUT_DEPTH = 3
+# After the last move the snake can still need some time to fall on the finish and do its animation
+MAX_FINISH_TICKS = 1000
+
+
+# Everything about the state of the level that the next moves depend on (not the undo stack)
+def get_state_key(engine: game_engine.Engine) -> tuple:
+    level = engine.level
+    return (tuple(level.snake.blocks), level.snake.charge,
+            tuple((entity.x, entity.y) for entity in level.dynamic),
+            tuple(entity.eaten for entity in engine.static_engine.food),
+            engine.snake_is_falling, engine.first_frame_falling, engine.falling_frame_countdown,
+            engine.level_finish_animation, engine.level_finish_frame_countdown)
+
+
+# Plays the moves like the AI playback does (one engine tick per move) and lets the snake finish the level
+def is_solution(level: game_engine.Level, moves: list[game_engine.Action]) -> bool:
+    return plays_to_finish(game_engine.Engine(copy.deepcopy(level)), moves)
+
+
+def plays_to_finish(engine: game_engine.Engine, moves: list[game_engine.Action]) -> bool:
+    for move in moves:
+        engine.process_frame(move)
+
+    for _ in range(MAX_FINISH_TICKS):
+        if engine.level_finished:
+            return True
+        engine.process_frame(game_engine.Action.DO_NOTHING)
+    return engine.level_finished
+
+
+# Shortens a solution of the level (like SnakeAI.final_path) - the brute force leaves detours in it
+#  returns the original solution if it could not be shortened or the shorter one does not finish the level
+def optimize_solution(level: game_engine.Level, moves: typing.Iterable[game_engine.Action]) \
+        -> list[game_engine.Action]:
+    moves = list(moves)
+    # One engine for everything, it gets put back to the start with a snapshot
+    engine = game_engine.Engine(copy.deepcopy(level))
+    start = engine.snapshot()
+
+    # Shortcuts change the path, so the next pass can find shortcuts that were not there before
+    optimized = moves
+    while True:
+        engine.restore(start)
+        shorter = shorten_solution(engine, optimized)
+        if len(shorter) >= len(optimized):
+            break
+        optimized = shorter
+
+    engine.restore(start)
+    if len(optimized) < len(moves) and plays_to_finish(engine, optimized):
+        return optimized
+    return moves
+
+
+# The shortened solution and where its states are in it, to switch to it while the original one is being played
+def optimize_and_index(level: game_engine.Level, moves: list[game_engine.Action]) \
+        -> tuple[list[game_engine.Action], dict[tuple, int]]:
+    optimized = optimize_solution(level, moves)
+    return optimized, index_states(level, optimized)
+
+
+# Where every state of the solution is in it (the last time it is there) by its key
+#  to find out when a different solution of the level gets to a state of this one
+def index_states(level: game_engine.Level, moves: list[game_engine.Action]) -> dict[tuple, int]:
+    engine = game_engine.Engine(copy.deepcopy(level))
+    states = {get_state_key(engine): 0}
+    for i, move in enumerate(moves):
+        engine.process_frame(move)
+        states[get_state_key(engine)] = i + 1
+    return states
+
+
+# One pass over the solution - it gets played without showing anything and the state after every move gets saved
+#  (by its key), then from every state the moves that get back to a state on the path are cut out (loops)
+#  and the moves that get to a later state in fewer moves are tried (shortcuts)
+#  the engine has to be at the start of the level
+def shorten_solution(engine: game_engine.Engine, moves: list[game_engine.Action]) -> list[game_engine.Action]:
+    # States after every move, the moves after the snake reached the finish do not do anything
+    snapshots = [engine.snapshot()]
+    keys = [get_state_key(engine)]
+    for i, move in enumerate(moves):
+        engine.process_frame(move)
+        # Nothing here undoes moves, without the undo stack the snapshots stay small
+        engine.undo_stack.clear()
+        snapshots.append(engine.snapshot())
+        keys.append(get_state_key(engine))
+        if engine.level_finish_animation:
+            moves = moves[:i + 1]
+            break
+
+    finish = len(moves)
+    reaches_finish = engine.level_finish_animation
+    # The last time every state appears on the path
+    last_index = {key: i for i, key in enumerate(keys)}
+
+    optimized = []
+    i = 0
+    while i < finish:
+        # A loop back to the same state
+        i = last_index[keys[i]]
+        if i == finish:
+            break
+
+        shortcut = find_shortcut(engine, snapshots[i], last_index, i, finish if reaches_finish else None)
+        if shortcut:
+            shortcut_moves, i = shortcut
+            optimized.extend(shortcut_moves)
+        else:
+            optimized.append(moves[i])
+            i += 1
+
+    return optimized
+
+
+# Searches all move sequences up to SHORTCUT_DEPTH long from the state for one that gets further on the path
+#  than the path itself would with that many moves - any state at the finish counts as the end of the path
+#  returns the moves and the index of the state on the path they get to, or None
+def find_shortcut(engine: game_engine.Engine, start: game_engine.EngineSnapshot, last_index: dict[tuple, int],
+                  start_index: int, finish: int | None) \
+        -> tuple[list[game_engine.Action], int] | None:
+    best: tuple[list[game_engine.Action], int] | None = None
+    saved = 0
+    # Breadth first, so the first way to a state found is the shortest one
+    queue: list[tuple[game_engine.EngineSnapshot, list[game_engine.Action]]] = [(start, [])]
+    engine.restore(start)
+    seen = {get_state_key(engine)}
+
+    for depth in range(1, SHORTCUT_DEPTH + 1):
+        next_queue = []
+        for snapshot, path in queue:
+            for move in MOVES:
+                engine.restore(snapshot)
+                engine.process_frame(move)
+                engine.undo_stack.clear()
+
+                if engine.level_finish_animation and finish is not None:
+                    index = finish
+                else:
+                    key = get_state_key(engine)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    index = last_index.get(key, -1)
+
+                # Shorter than the path between the two states
+                if index - start_index - depth > saved:
+                    saved = index - start_index - depth
+                    best = (path + [move], index)
+
+                if depth < SHORTCUT_DEPTH and not engine.level_finish_animation:
+                    next_queue.append((engine.snapshot(), path + [move]))
+        queue = next_queue
+
+    return best
@@ -1,14 +1,22 @@
 import collections
 import math
+import time
 
 import game_engine
 import ai
 
+# How far around the snake to preprocess the level before brute forcing the next step of the path
+AI_PREFETCH_RADIUS = 16
+
 
 # "AI" is a strong name for this almost brute force algorithm but whatever
 class SnakeAI:
     def __init__(self, level: game_engine.Level, engine: game_engine.StaticEngine):
         self.level: game_engine.Level = level
+
+        # What the AI does to find the solution, counted for every subgoal (A* search or brute force to a block)
+        #  only when enabled, counting slows the AI down
+        self.telemetry: ai.AITelemetry | None = None
         self.engine: game_engine.StaticEngine = engine
 
         # The path from start to finish
@@ -25,11 +33,23 @@ class SnakeAI:
         # The victory square, not used for pathfinding but for when to stop pathfinding and return the solution
         self.victory_square: tuple[int, int] | None = None
         self.level_finished = False
+        # Set when there is no path to the next food or the finish, the AI gives up then
+        self.no_path = False
 
         # First move is always down because the snake does not start on the ground
         self.first_move = True
 
+    # Call before the AI starts looking for the solution
+    def enable_telemetry(self) -> None:
+        self.telemetry = ai.AITelemetry()
+        self.engine = ai.CountingStaticEngine(self.engine, self.telemetry)
+        self.find_path.engine = self.engine
+        self.find_path.telemetry = self.telemetry
+
     def get_next_move(self) -> game_engine.Action:
+        if self.no_path:
+            return game_engine.Action.DO_NOTHING
+
         # First move is always down because the snake does not start on the ground - too lazy to account for this
         if self.first_move:
             self.first_move = False
@@ -38,12 +58,17 @@ class SnakeAI:
 
         if self.find_path_force:
             if self.find_path_force.is_finished:
+                if self.telemetry:
+                    self.telemetry.end(self.find_path_force.found)
                 self.find_path_force = None
 
                 return self.get_next_move()
             else:
                 # Continue with brute force
+                start = time.perf_counter()
                 move = self.find_path_force.get_next_move()
+                if self.telemetry:
+                    self.count_brute_force_move(move, time.perf_counter() - start)
 
                 # Save move to reconstruct the path
                 if move == game_engine.Action.UNDO_MOVEMENT:
@@ -54,6 +79,8 @@ class SnakeAI:
 
                 # If the snake is about to win stops pathfinding and shows the final AI solution
                 if self.about_to_win():
+                    if self.telemetry:
+                        self.telemetry.end(True)
                     self.level_finished = True
                     return game_engine.Action.DO_NOTHING
 
@@ -63,7 +90,13 @@ class SnakeAI:
 
         # Go to the next block in the path
         if self.path:
-            self.find_path_force = ai.FindPathForce(snake_head, self.path.popleft(), self.engine,
+            # The brute force searches only around the snake, big levels get preprocessed there in advance
+            self.engine.prefetch(snake_head[0] - AI_PREFETCH_RADIUS, snake_head[1] - AI_PREFETCH_RADIUS,
+                                 2*AI_PREFETCH_RADIUS + 1, 2*AI_PREFETCH_RADIUS + 1)
+            destination = self.path.popleft()
+            if self.telemetry:
+                self.telemetry.begin("brute_force", snake_head, destination)
+            self.find_path_force = ai.FindPathForce(snake_head, destination, self.engine,
                                                  len(self.level.snake.blocks), self.level.width, self.level.height)
             return self.get_next_move()
 
@@ -75,15 +108,40 @@ class SnakeAI:
         if nearest_food:
             # There is food on the map, try to find a path to it
 
-            self.path = self.find_path.astar(snake_head, nearest_food)
+            self.path = self.astar(snake_head, nearest_food)
+            self.no_path = not self.path
             return self.get_next_move()
 
         # All food eaten, find path to the finish
         nearest_finish = self.get_nearest_finish()
         self.victory_square = nearest_finish
-        self.path = self.find_path.astar(snake_head, nearest_finish)
+        self.path = self.astar(snake_head, nearest_finish)
+        self.no_path = not self.path
         return self.get_next_move()
 
+    def astar(self, start: tuple[int, int], goal: tuple[int, int]) -> collections.deque[tuple[int, int]]:
+        if not self.telemetry:
+            return self.find_path.astar(start, goal)
+
+        subgoal = self.telemetry.begin("astar", start, goal)
+        search_start = time.perf_counter()
+        path = self.find_path.astar(start, goal)
+        subgoal.time += time.perf_counter() - search_start
+        self.telemetry.end(bool(path))
+        return path
+
+    # Counts the move the brute force made and how long it took to find it
+    def count_brute_force_move(self, move: game_engine.Action, seconds: float) -> None:
+        subgoal = self.telemetry.current
+        subgoal.time += seconds
+        subgoal.max_stack_depth = max(subgoal.max_stack_depth, len(self.find_path_force.move_stack))
+
+        if move == game_engine.Action.UNDO_MOVEMENT:
+            subgoal.undos += 1
+        elif move in [game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
+                      game_engine.Action.MOVE_UP, game_engine.Action.MOVE_DOWN]:
+            subgoal.pushes += 1
+
     # Returns the nearest food to the current snake head
     def get_nearest_food(self) -> tuple[int, int] | None:
         all_food = [
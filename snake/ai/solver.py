@@ -0,0 +1,40 @@
+import copy
+
+import game_engine
+import ai
+
+# The AI gives up on a level after this many moves (it can get stuck on levels it can not solve)
+MAX_SOLVE_TICKS = 200_000
+# Levels the AI does not solve in this many moves per column of the level count as unsolvable
+#  (it solves the levels it can in a lot less, so waiting for the full limit would only slow down generating levels)
+SOLVABLE_TICKS_PER_COLUMN = 50
+
+
+# Lets the AI solve the level without showing anything (the level itself is not changed)
+#  returns the solution and how many moves the AI needed to find it, or None when the AI could not solve the level
+#  the AI stops when it is next to the finish, so the solution gets played back to check that it finishes the level
+def solve_level(level: game_engine.Level, max_ticks: int = MAX_SOLVE_TICKS) \
+        -> tuple[list[game_engine.Action], int] | None:
+    level_copy = copy.deepcopy(level)
+    engine = game_engine.Engine(level_copy)
+    snake_ai = ai.SnakeAI(level_copy, engine.static_engine)
+
+    ticks = 0
+    # The snake can also get to the finish before the AI planned to (by falling on it)
+    while not snake_ai.level_finished and not engine.level_finish_animation:
+        if ticks == max_ticks:
+            return None
+
+        engine.process_frame(snake_ai.get_next_move())
+        if snake_ai.no_path:
+            return None
+        ticks += 1
+
+    solution = list(snake_ai.final_path)
+    if not ai.is_solution(level, solution):
+        return None
+    return solution, ticks
+
+
+def is_solvable(level: game_engine.Level) -> bool:
+    return solve_level(level, SOLVABLE_TICKS_PER_COLUMN*level.width) is not None
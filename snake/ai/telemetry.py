@@ -0,0 +1,93 @@
+import json
+import time
+
+import game_engine
+
+
+# Counters and timers of one subgoal of the AI - an A* search for the path or a brute force to its next block
+class Subgoal:
+    def __init__(self, kind: str, start: tuple[int, int] | None, destination: tuple[int, int] | None):
+        self.kind = kind
+        self.start = start
+        self.destination = destination
+
+        # Time spent looking for moves (not the time the moves take to play)
+        self.time = 0.0
+        # None while the subgoal is still being worked on
+        self.found: bool | None = None
+
+        # A* - expanded positions and neighbors that A* already knew about
+        self.expansions = 0
+        self.node_cache_hits = 0
+
+        # Brute force - moves tried, moves taken back and the deepest the move stack got
+        self.pushes = 0
+        self.undos = 0
+        self.max_stack_depth = 0
+
+        self.get_reach_calls = 0
+        self.get_interactions_calls = 0
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+# Everything the AI did during one attempt at a level, split into subgoals
+class AITelemetry:
+    def __init__(self):
+        self.subgoals: list[Subgoal] = []
+        # Work done outside of any subgoal (like looking for the nearest food)
+        self.other = Subgoal("other", None, None)
+        self.current = self.other
+
+        # Set when the attempt was saved, it should be saved only once
+        self.written = False
+
+    def begin(self, kind: str, start: tuple[int, int], destination: tuple[int, int]) -> Subgoal:
+        self.current = Subgoal(kind, start, destination)
+        self.subgoals.append(self.current)
+        return self.current
+
+    def end(self, found: bool) -> None:
+        self.current.found = found
+        self.current = self.other
+
+    # Sums of all counters and timers
+    def get_totals(self) -> dict:
+        totals = {"subgoals": len(self.subgoals)}
+        for subgoal in self.subgoals + [self.other]:
+            for name, value in vars(subgoal).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[name] = max(totals.get(name, 0), value) if name == "max_stack_depth" \
+                        else totals.get(name, 0) + value
+        return totals
+
+    # Appends the attempt as one JSON line
+    def write(self, path: str, level_number: int, finished: bool) -> None:
+        if self.written:
+            return
+        self.written = True
+
+        with open(path, "a") as f:
+            f.write(json.dumps({
+                "time": time.time(),
+                "level": level_number,
+                "finished": finished,
+                "totals": self.get_totals(),
+                "subgoals": [subgoal.to_dict() for subgoal in self.subgoals],
+                "other": self.other.to_dict()
+            }) + "\n")
+
+
+# Counts the interactions the AI asks for, everything else goes straight to the static engine
+class CountingStaticEngine:
+    def __init__(self, engine: game_engine.StaticEngine, telemetry: AITelemetry):
+        self.engine = engine
+        self.telemetry = telemetry
+
+    def get_interactions(self, x: int, y: int) -> set[game_engine.Interaction]:
+        self.telemetry.current.get_interactions_calls += 1
+        return self.engine.get_interactions(x, y)
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
@@ -0,0 +1,66 @@
+import argparse
+import sys
+import typing
+
+import benchmarks
+
+# Benchmark groups that can be run separately, every group returns a list of results
+BENCHMARK_GROUPS: dict[str, typing.Callable[[int], list[benchmarks.BenchmarkResult]]] = {
+    "engine": benchmarks.run_engine,
+    "static_engine": benchmarks.run_static_engine,
+    "reach": benchmarks.run_reach,
+    "ai": benchmarks.run_ai,
+    "render": benchmarks.run_render,
+}
+
+
+# Runs the benchmarks and compares them with the baseline, returns whether there was a regression
+def run(groups: list[str], repeats: int, baseline_path: str, save: bool, threshold: float) -> bool:
+    baseline = benchmarks.load_baseline(baseline_path)
+    results = []
+    regressions = []
+
+    for group in groups:
+        for result in BENCHMARK_GROUPS[group](repeats):
+            results.append(result)
+
+            line = f"{result.name:<40} {result.value:>14.2f} {result.unit:<12}"
+            if result.name in baseline:
+                change = benchmarks.get_change(result, baseline[result.name])
+                line += f" {baseline[result.name].value:>14.2f} {change:>+8.1%}"
+                if benchmarks.is_regression(result, baseline[result.name], threshold):
+                    regressions.append(result)
+                    line += "  REGRESSION"
+            print(line, flush=True)
+
+    if save:
+        benchmarks.save_baseline(baseline_path, results)
+        print(f"Baseline saved to {baseline_path}")
+
+    if regressions:
+        print(f"{len(regressions)} regressions over {threshold:.0%}: {', '.join(result.name for result in regressions)}")
+    return bool(regressions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("groups", nargs="*", metavar="GROUP",
+                        help=f"Benchmark groups to run: {', '.join(BENCHMARK_GROUPS)} (default: all)")
+    parser.add_argument("--repeats", type=int, default=benchmarks.REPEATS,
+                        help=f"How many times each benchmark runs, the fastest run counts (default: {benchmarks.REPEATS})")
+    parser.add_argument("--baseline", metavar="PATH", default="benchmarks/baseline.json",
+                        help="Baseline results to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Saves the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=benchmarks.REGRESSION_THRESHOLD,
+                        help=f"How much worse than the baseline a result can be before it fails "
+                             f"(default: {benchmarks.REGRESSION_THRESHOLD})")
+    args = parser.parse_args()
+
+    for group in args.groups:
+        if group not in BENCHMARK_GROUPS:
+            parser.error(f"unknown benchmark group {group} (choose from {', '.join(BENCHMARK_GROUPS)})")
+
+    regression = run(args.groups or list(BENCHMARK_GROUPS), args.repeats, args.baseline, args.save_baseline,
+                     args.threshold)
+    sys.exit(1 if regression else 0)
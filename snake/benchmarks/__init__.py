@@ -0,0 +1,7 @@
+from .measure import BenchmarkResult, best_time, REPEATS
+from .baseline import load_baseline, save_baseline, get_change, is_regression, REGRESSION_THRESHOLD
+from .fake_canvas import FakeCanvas
+from .levels import get_bundled_levels, get_level_sets, solve_level, CORPUS_SEED
+from .engine_benchmarks import run_engine, run_static_engine
+from .ai_benchmarks import run_reach, run_ai
+from .render_benchmarks import run_render
@@ -0,0 +1,90 @@
+import copy
+
+import utils
+import game_engine
+import ai
+import benchmarks
+
+# Snake lengths the reach and the A* search get measured with, the reach grows with the square of the length
+REACH_LENGTHS = (4, 8, 16, 32)
+ASTAR_LENGTHS = (4, 8, 16)
+# Size of the generated level the reach gets measured on and how many positions on the ground are used
+REACH_LEVEL_SIZE = 128
+REACH_POSITIONS = 200
+
+
+# ai.get_reach calls per second depending on the snake length, from positions on the ground of a generated level
+def run_reach(repeats: int) -> list[benchmarks.BenchmarkResult]:
+    level, _, _ = utils.generate_level(utils.LevelParameters(REACH_LEVEL_SIZE, REACH_LEVEL_SIZE, 0.1), 0)
+    static_engine = game_engine.StaticEngine(level.static)
+
+    positions = [(x, y) for y in range(1, level.height + 1) for x in range(1, level.width + 1)
+                 if game_engine.Interaction.WALL not in static_engine.get_interactions(x, y)
+                 and game_engine.Interaction.WALL in static_engine.get_interactions(x, y + 1)][:REACH_POSITIONS]
+
+    results = []
+    for length in REACH_LENGTHS:
+        def reach(_):
+            for position in positions:
+                ai.get_reach(position, static_engine, length, level.width, level.height)
+
+        seconds = benchmarks.best_time(reach, repeats=repeats)
+        results.append(benchmarks.BenchmarkResult(f"ai.get_reach.length{length}",
+                                                  len(positions) / seconds, "calls/s", True))
+    return results
+
+
+# A* expansions per second depending on the snake length, from the start of the level to the finish
+#  and how long the AI takes to solve the levels (and how long its solutions are)
+def run_ai(repeats: int) -> list[benchmarks.BenchmarkResult]:
+    results = []
+
+    for set_name, levels in benchmarks.get_level_sets():
+        for length in ASTAR_LENGTHS:
+            expansions = 0
+            seconds = 0.0
+
+            for level in levels:
+                static_engine = game_engine.StaticEngine(level.static, level.compiled_static)
+                start = get_start_position(level)
+                finish = next(entity for entity in level.static if isinstance(entity, game_engine.entities.Finish))
+                goal = finish.get_interact_coords()[0]
+                telemetry = ai.AITelemetry()
+
+                def search(find_path: ai.FindPathStatic):
+                    telemetry.begin("astar", start, goal)
+                    find_path.astar(start, goal)
+
+                def create_find_path() -> ai.FindPathStatic:
+                    find_path = ai.FindPathStatic(static_engine, level.width, level.height, telemetry)
+                    find_path.update_length(length)
+                    return find_path
+
+                seconds += benchmarks.best_time(search, create_find_path, repeats)
+                expansions += telemetry.current.expansions
+
+            results.append(benchmarks.BenchmarkResult(f"ai.astar.{set_name}.length{length}",
+                                                      expansions / seconds, "expansions/s", True))
+
+        seconds = sum(benchmarks.best_time(benchmarks.solve_level, lambda: level, repeats) for level in levels)
+        results.append(benchmarks.BenchmarkResult(f"ai.solve.{set_name}", seconds*1000, "ms", False))
+        solutions = [benchmarks.solve_level(level) for level in levels]
+        moves = sum(len(solution) for solution in solutions)
+        results.append(benchmarks.BenchmarkResult(f"ai.solution_length.{set_name}", moves, "moves", False))
+
+        seconds = sum(benchmarks.best_time(lambda _: ai.optimize_solution(level, solution), repeats=repeats)
+                      for level, solution in zip(levels, solutions))
+        results.append(benchmarks.BenchmarkResult(f"ai.optimize.{set_name}", seconds*1000, "ms", False))
+        moves = sum(len(ai.optimize_solution(level, solution)) for level, solution in zip(levels, solutions))
+        results.append(benchmarks.BenchmarkResult(f"ai.optimized_length.{set_name}", moves, "moves", False))
+
+    return results
+
+
+# Where the snake head is once it falls to the ground at the start of the level
+def get_start_position(level: game_engine.Level) -> tuple[int, int]:
+    engine = game_engine.Engine(copy.deepcopy(level))
+    engine.process_frame(game_engine.Action.MOVE_DOWN)
+    while engine.snake_is_falling:
+        engine.process_frame(game_engine.Action.DO_NOTHING)
+    return engine.level.snake.blocks[0]
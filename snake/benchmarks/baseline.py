@@ -0,0 +1,39 @@
+import json
+import os
+
+import benchmarks
+
+# Results can get this much worse than the baseline (0.2 = 20 %) before they count as a regression
+#  timings of the same code differ a bit from run to run
+REGRESSION_THRESHOLD = 0.2
+
+
+def load_baseline(path: str) -> dict[str, benchmarks.BenchmarkResult]:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "r") as f:
+        return {name: benchmarks.BenchmarkResult.from_dict(name, data) for name, data in json.load(f).items()}
+
+
+# Results of benchmarks that did not run this time stay in the baseline
+def save_baseline(path: str, results: list[benchmarks.BenchmarkResult]) -> None:
+    baseline = {name: result.to_dict() for name, result in load_baseline(path).items()}
+    baseline.update({result.name: result.to_dict() for result in results})
+
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+# How much better the result is than the baseline (-0.3 = 30 % worse)
+def get_change(result: benchmarks.BenchmarkResult, baseline: benchmarks.BenchmarkResult) -> float:
+    if baseline.value == 0:
+        return 0.0
+    change = (result.value - baseline.value) / baseline.value
+    return change if result.higher_is_better else -change
+
+
+def is_regression(result: benchmarks.BenchmarkResult, baseline: benchmarks.BenchmarkResult,
+                  threshold: float = REGRESSION_THRESHOLD) -> bool:
+    return get_change(result, baseline) < -threshold
@@ -0,0 +1,73 @@
+import copy
+
+import utils
+import game_engine
+import benchmarks
+
+# Sizes of the generated levels the static engine gets built for (width and height)
+#  up to game_engine.CHUNKED_LEVEL_AREA the whole level is preprocessed at once
+STATIC_ENGINE_SIZES = (64, 128, 256, 512)
+STATIC_ENGINE_WALL_DENSITY = 0.1
+# Bigger levels are preprocessed only around the camera, the time until the first screen can be shown is measured
+#  (the sparse one gets only an index of the entity rectangles)
+BIG_LEVELS = ((2048, 0.1), (4096, 0.005))
+
+
+# Engine.process_frame steps per second on scripted action sequences
+#  playback - the AI solution of the level with the frames in between moves (falling and the finish animation)
+#  undo - the same and then undoing all of it
+def run_engine(repeats: int) -> list[benchmarks.BenchmarkResult]:
+    results = []
+
+    for set_name, levels in benchmarks.get_level_sets():
+        steps = {"playback": 0, "undo": 0}
+        seconds = {"playback": 0.0, "undo": 0.0}
+
+        for level in levels:
+            playback = []
+            for action in benchmarks.solve_level(level):
+                playback.append(action)
+                playback.extend([game_engine.Action.DO_NOTHING]*game_engine.engine.FREEZE_FRAMES)
+
+            engine = game_engine.Engine(copy.deepcopy(level))
+            play(engine, playback)
+            undo = playback + [game_engine.Action.UNDO_MOVEMENT]*len(engine.undo_stack)
+
+            for name, script in (("playback", playback), ("undo", undo)):
+                steps[name] += len(script)
+                seconds[name] += benchmarks.best_time(lambda engine: play(engine, script),
+                                                      lambda: game_engine.Engine(copy.deepcopy(level)), repeats)
+
+        for name in steps:
+            results.append(benchmarks.BenchmarkResult(f"engine.{name}.{set_name}",
+                                                      steps[name] / seconds[name], "steps/s", True))
+
+    return results
+
+
+# How long preprocessing the static entities takes depending on the level size
+def run_static_engine(repeats: int) -> list[benchmarks.BenchmarkResult]:
+    results = []
+
+    for size in STATIC_ENGINE_SIZES:
+        level, _, _ = utils.generate_level(utils.LevelParameters(size, size, STATIC_ENGINE_WALL_DENSITY), 0)
+        seconds = benchmarks.best_time(lambda _: game_engine.StaticEngine(level.static), repeats=repeats)
+        results.append(benchmarks.BenchmarkResult(f"static_engine.build.{size}x{size}", seconds*1000, "ms", False))
+
+    for size, wall_density in BIG_LEVELS:
+        level, _, _ = utils.generate_level(utils.LevelParameters(size, size, wall_density), 0)
+        seconds = benchmarks.best_time(lambda _: create_and_prefetch(level), repeats=repeats)
+        results.append(benchmarks.BenchmarkResult(f"static_engine.first_screen.{size}x{size}",
+                                                  seconds*1000, "ms", False))
+
+    return results
+
+
+def play(engine: game_engine.Engine, script: list[game_engine.Action]) -> None:
+    for action in script:
+        engine.process_frame(action)
+
+
+def create_and_prefetch(level: game_engine.Level) -> None:
+    static_engine = game_engine.create_static_engine(level)
+    static_engine.prefetch(0, level.height - 17, 17, 17)
@@ -0,0 +1,44 @@
+import collections
+
+
+# Stands in for tkinter.Canvas when measuring rendering, it only counts the items the scenes create
+#  (tkinter needs a display and its own drawing time would hide the time spent in the scenes)
+class FakeCanvas:
+    def __init__(self):
+        # Ids of the items currently on the canvas and all items created so far by type ("rectangle", "text", ...)
+        self.items: set[int] = set()
+        self.next_id = 1
+        self.created: collections.Counter[str] = collections.Counter()
+
+    def create_rectangle(self, *args, **kwargs) -> int:
+        return self.create("rectangle")
+
+    def create_text(self, *args, **kwargs) -> int:
+        return self.create("text")
+
+    def create_line(self, *args, **kwargs) -> int:
+        return self.create("line")
+
+    def create_polygon(self, *args, **kwargs) -> int:
+        return self.create("polygon")
+
+    def create(self, item_type: str) -> int:
+        item = self.next_id
+        self.next_id += 1
+        self.items.add(item)
+        self.created[item_type] += 1
+        return item
+
+    # Deletes items by id or everything with "all" (other tags are not tracked)
+    def delete(self, *items) -> None:
+        for item in items:
+            if item == "all":
+                self.items.clear()
+            else:
+                self.items.discard(item)
+
+    def tag_raise(self, *args) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
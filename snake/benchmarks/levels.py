@@ -0,0 +1,38 @@
+import functools
+import os
+
+import utils
+import game_engine
+import ai
+
+# Bundled levels are numbered from 1, the level select has room for 16
+MAX_LEVEL_NUMBER = 16
+# Seed of the generated corpora, changing it changes the levels and makes the baseline useless
+CORPUS_SEED = 0
+
+
+# Numbers of the levels in the resources folder
+def get_bundled_levels() -> list[int]:
+    return [level_number for level_number in range(1, MAX_LEVEL_NUMBER + 1)
+            if os.path.exists(f"{utils.get_resources_path()}/{level_number}.hadik")]
+
+
+# Levels the engine and the AI get measured on, by name - every bundled level on its own and the generated corpora
+#  generated only once because checking that the AI can solve them takes a while
+@functools.lru_cache(maxsize=None)
+def get_level_sets() -> tuple[tuple[str, tuple[game_engine.Level, ...]], ...]:
+    level_sets = [(f"level{level_number}", (utils.load_level(level_number)[0],))
+                  for level_number in get_bundled_levels()]
+
+    for name in utils.CORPORA:
+        corpus = utils.generate_corpus(name, CORPUS_SEED, ai.is_solvable)
+        level_sets.append((name, tuple(level for level, _, _, _ in corpus)))
+
+    return tuple(level_sets)
+
+
+def solve_level(level: game_engine.Level) -> list[game_engine.Action]:
+    solved = ai.solve_level(level)
+    if solved is None:
+        raise RuntimeError("The AI did not solve the level")
+    return solved[0]
@@ -0,0 +1,36 @@
+import time
+import typing
+
+# How many times every benchmark runs by default, only the fastest run counts
+#  (the slower ones got interrupted by something else running on the machine)
+REPEATS = 5
+
+T = typing.TypeVar("T")
+
+
+# One measured number, like steps per second or milliseconds to build something
+class BenchmarkResult:
+    def __init__(self, name: str, value: float, unit: str, higher_is_better: bool):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def to_dict(self) -> dict:
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+    @staticmethod
+    def from_dict(name: str, data: dict) -> "BenchmarkResult":
+        return BenchmarkResult(name, data["value"], data["unit"], data["higher_is_better"])
+
+
+# Fastest time of run(setup()) in seconds, setup is not measured (for example a fresh copy of the level)
+def best_time(run: typing.Callable[[T], object], setup: typing.Callable[[], T] = lambda: None,
+              repeats: int = REPEATS) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,35 @@
+import benchmarks
+import scenes
+
+# How many frames get drawn in one run and the screen size they get drawn at
+RENDER_FRAMES = 100
+SCREEN_SIZE = 700
+
+
+# Full redraws per second of the scenes on a fake canvas and how many canvas items one frame has
+#  (tkinter gets slower with every item on the canvas, so fewer items is better even when drawing is fast)
+def run_render(repeats: int) -> list[benchmarks.BenchmarkResult]:
+    results = []
+
+    scenes_to_draw = [("main_menu", lambda canvas: scenes.MainMenu(canvas))]
+    for level_number in benchmarks.get_bundled_levels():
+        for debug in (False, True):
+            scenes_to_draw.append((f"game.level{level_number}{'.debug' if debug else ''}",
+                                   lambda canvas, level_number=level_number, debug=debug:
+                                   scenes.Game(canvas, level_number, False, debug)))
+
+    for name, create_scene in scenes_to_draw:
+        canvas = benchmarks.FakeCanvas()
+        scene = create_scene(canvas)
+
+        seconds = benchmarks.best_time(lambda _: draw(canvas, scene), repeats=repeats)
+        results.append(benchmarks.BenchmarkResult(f"render.{name}", RENDER_FRAMES / seconds, "frames/s", True))
+        results.append(benchmarks.BenchmarkResult(f"render.{name}.items", len(canvas.items), "items", False))
+
+    return results
+
+
+def draw(canvas: benchmarks.FakeCanvas, scene: scenes.Scene) -> None:
+    for _ in range(RENDER_FRAMES):
+        canvas.delete("all")
+        scene.display_frame(0, 0, SCREEN_SIZE)
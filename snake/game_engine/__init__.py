@@ -3,5 +3,11 @@ import game_engine.entities
 from .game_actions import Action
 from .undo import EatenFood, EntityPosition, Undo
 from .level import Level
-from .static_engine import StaticEngine, Interaction
-from .engine import Engine
+from .static_engine import StaticEngine, Interaction, InteractionType, CompiledStatic, compile_static
+from .chunked_static_engine import ChunkedStaticEngine
+from .rect_index_static_engine import RectIndexStaticEngine
+from .engine import Engine, CHUNKED_LEVEL_AREA, SPARSE_LEVEL_DENSITY, create_static_engine
+from .snapshot import EngineSnapshot
+from .recording import Recording, hash_level, RESTART
+from .replay import Replayer, KEYFRAME_INTERVAL
+from .timeline import Timeline, CHECKPOINT_INTERVAL, CHECKPOINT_SPACING
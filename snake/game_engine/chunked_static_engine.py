@@ -0,0 +1,212 @@
+import collections
+import typing
+
+import utils
+import game_engine
+from game_engine.static_engine import Interaction, InteractionType, InteractionGroup, STATIC_INTERACTIONS, \
+    FLAG_INTERACTIONS, get_flag, rasterize
+
+# The level is split into square chunks of this many blocks, only chunks around the snake and the camera
+#  are kept preprocessed, the least recently used ones get thrown away
+CHUNK_SIZE = 32
+MAX_LOADED_CHUNKS = 64
+
+
+class Chunk:
+    def __init__(self, grid: bytearray, position_hash: typing.Dict[tuple[int, int], list[int]]):
+        # Static interaction flags of the chunk, row by row
+        self.grid = grid
+        # What group_ids 10+ are in what positions of the chunk
+        self.position_hash = position_hash
+
+
+# Chunks without any entities, shared because there is nothing in them that could change
+EMPTY_CHUNK = Chunk(bytearray(CHUNK_SIZE*CHUNK_SIZE), {})
+
+
+# Same interactions as the StaticEngine, but preprocessed chunk by chunk when they are needed
+#  used for levels too big to preprocess all at once, the entities themselves still stay in the level
+class ChunkedStaticEngine:
+    def __init__(self, static: list[game_engine.entities.StaticEntity]):
+        self._static = static
+
+        # Same group ids as in the StaticEngine
+        self._group_hash: typing.Dict[int, InteractionGroup] = {
+            Interaction.WALL.value: InteractionGroup(Interaction.WALL, InteractionType.STATIC),
+            Interaction.HAZARD.value: InteractionGroup(Interaction.HAZARD, InteractionType.STATIC),
+            Interaction.CHARGE.value: InteractionGroup(Interaction.CHARGE, InteractionType.STATIC),
+            Interaction.FINISH.value: InteractionGroup(Interaction.FINISH, InteractionType.STATIC),
+            Interaction.FOOD.value: InteractionGroup(Interaction.FOOD, InteractionType.STATIC)
+        }
+        self.next_group_id = 10
+
+        self.version = 0
+
+        # Static charge is decided by the charge the entities had when the level was loaded
+        #  (chunks can get preprocessed again later when the charge of the entities changed)
+        self._static_charge = [entity.charge for entity in static]
+
+        # What group_id is each entity in (by its index)
+        self._entity_groups: typing.Dict[int, int] = {}
+        # Same as in the StaticEngine
+        self.food: list[game_engine.entities.Food] = []
+
+        for i, entity in enumerate(static):
+            if entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FOOD:
+                group = InteractionGroup(Interaction.FOOD, InteractionType.FOOD)
+                group.entities = entity
+                self.food.append(entity)
+                self._add_group(group, [i])
+
+        # Charge has to be grouped for the whole level, connected entities can go across many chunks
+        indexes = {id(entity): i for i, entity in enumerate(static)}
+        for connected_entities in utils.get_connected_conductive_groups(static):
+            group = InteractionGroup(Interaction.CHARGE, InteractionType.CHARGE)
+            group.entities = connected_entities
+            self._add_group(group, [indexes[id(entity)] for entity in connected_entities])
+
+        # Indexes of the entities that have any interaction in each chunk
+        self._chunk_entities: typing.Dict[tuple[int, int], set[int]] = {}
+        for i, entity in enumerate(static):
+            for x, y, width, height in get_all_rects(entity):
+                if width <= 0 or height <= 0:
+                    continue
+                for chunk_x in range(x // CHUNK_SIZE, (x + width - 1) // CHUNK_SIZE + 1):
+                    for chunk_y in range(y // CHUNK_SIZE, (y + height - 1) // CHUNK_SIZE + 1):
+                        self._chunk_entities.setdefault((chunk_x, chunk_y), set()).add(i)
+
+        # Preprocessed chunks, from the least recently used
+        self._chunks: collections.OrderedDict[tuple[int, int], Chunk] = collections.OrderedDict()
+
+    def get_interactions(self, x: int, y: int) -> set[Interaction]:
+        chunk = self._get_chunk(x, y)
+        interactions = set(FLAG_INTERACTIONS[chunk.grid[get_chunk_index(x, y)]])
+
+        group_ids = chunk.position_hash.get((x, y))
+        if group_ids:
+            interactions.update(self._group_hash[group_id].interaction for group_id in group_ids)
+        return interactions
+
+    def get_group_ids(self, x: int, y: int) -> list[int]:
+        chunk = self._get_chunk(x, y)
+        flags = chunk.grid[get_chunk_index(x, y)]
+        static_ids = [interaction.value for interaction in STATIC_INTERACTIONS if flags & get_flag(interaction)]
+        return chunk.position_hash.get((x, y), []) + static_ids
+
+    def update_charge(self, x: int, y: int, charge: bool) -> None:
+        for group_id in self._get_chunk(x, y).position_hash.get((x, y), []):
+            group = self._group_hash[group_id]
+            if group.type == InteractionType.CHARGE:
+
+                group.interaction = Interaction.CHARGE if charge else Interaction.NOTHING
+                self.version += 1
+                # Propagates charge to all entities in the group
+                for entity in group.entities:
+                    entity.charge = charge
+
+    # The eaten state is kept in the food itself, so it survives the chunk being thrown away
+    def update_eaten_food(self, x: int, y: int, eaten: bool) -> None:
+        chunk = self._get_chunk(x, y)
+        for group_id in chunk.position_hash.get((x, y), []):
+            group = self._group_hash[group_id]
+
+            if group.type == InteractionType.FOOD and group.entities.eaten != eaten:
+                group.entities.eaten = eaten
+                group.interaction = Interaction.NOTHING if eaten else Interaction.FOOD
+                if eaten:
+                    chunk.grid[get_chunk_index(x, y)] &= ~get_flag(Interaction.WALL)
+                else:
+                    chunk.grid[get_chunk_index(x, y)] |= get_flag(Interaction.WALL)
+                self.version += 1
+
+    # Preprocesses all chunks in the area in advance (the camera view, where the AI is searching...)
+    def prefetch(self, x: int, y: int, width: int, height: int) -> None:
+        for chunk_x in range(x // CHUNK_SIZE, (x + width - 1) // CHUNK_SIZE + 1):
+            for chunk_y in range(y // CHUNK_SIZE, (y + height - 1) // CHUNK_SIZE + 1):
+                self._get_chunk(chunk_x*CHUNK_SIZE, chunk_y*CHUNK_SIZE)
+
+    def _add_group(self, group: InteractionGroup, entity_indexes: list[int]) -> None:
+        self._group_hash[self.next_group_id] = group
+        for i in entity_indexes:
+            self._entity_groups[i] = self.next_group_id
+        self.next_group_id += 1
+
+    def _get_chunk(self, x: int, y: int) -> Chunk:
+        key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+        if key not in self._chunk_entities:
+            return EMPTY_CHUNK
+
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = self._load_chunk(*key)
+        self._chunks[key] = chunk
+        if len(self._chunks) > MAX_LOADED_CHUNKS:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def _load_chunk(self, chunk_x: int, chunk_y: int) -> Chunk:
+        bounds = (chunk_x*CHUNK_SIZE, chunk_y*CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+        collision_rects: list[tuple[int, int, int, int]] = []
+        hazard_rects: list[tuple[int, int, int, int]] = []
+        charge_rects: list[tuple[int, int, int, int]] = []
+        finish_rects: list[tuple[int, int, int, int]] = []
+        group_positions: typing.Dict[tuple[int, int], set[int]] = {}
+
+        for i in self._chunk_entities[chunk_x, chunk_y]:
+            entity = self._static[i]
+            interact_type = entity.get_interact_type()
+
+            # Eaten food is not solid anymore
+            if not (interact_type == game_engine.entities.StaticEntity.InteractType.FOOD and entity.eaten):
+                collision_rects.extend(clip_rects(entity.get_collision_rects(), bounds))
+            hazard_rects.extend(clip_rects(entity.get_hurt_rects(), bounds))
+
+            if self._static_charge[i]:
+                charge_rects.extend(clip_rects(entity.get_electricity_rects(), bounds))
+
+            if interact_type == game_engine.entities.StaticEntity.InteractType.FINISH:
+                finish_rects.extend(clip_rects(entity.get_interact_rects(), bounds))
+
+            group_id = self._entity_groups.get(i)
+            if group_id is None:
+                continue
+            if interact_type == game_engine.entities.StaticEntity.InteractType.FOOD:
+                group_rects = clip_rects([(entity.x, entity.y, 1, 1)], bounds)
+            else:
+                group_rects = clip_rects(entity.get_electricity_rects(), bounds)
+            for x, y, width, height in group_rects:
+                for position in ((x + dx, y + dy) for dx in range(width) for dy in range(height)):
+                    group_positions.setdefault(position, set()).add(group_id)
+
+        layers = [(Interaction.WALL, collision_rects), (Interaction.HAZARD, hazard_rects),
+                  (Interaction.CHARGE, charge_rects), (Interaction.FINISH, finish_rects)]
+        # Groups are in the order of their ids like in the StaticEngine
+        position_hash = {position: sorted(group_ids) for position, group_ids in group_positions.items()}
+        return Chunk(rasterize(layers, *bounds), position_hash)
+
+
+def get_chunk_index(x: int, y: int) -> int:
+    return (y % CHUNK_SIZE)*CHUNK_SIZE + x % CHUNK_SIZE
+
+
+def get_all_rects(entity: game_engine.entities.StaticEntity) -> list[tuple[int, int, int, int]]:
+    return entity.get_collision_rects() + entity.get_hurt_rects() + entity.get_electricity_rects() \
+        + entity.get_interact_rects()
+
+
+# Cuts the rectangles to only the parts inside the bounds, rectangles outside are left out
+def clip_rects(rects: list[tuple[int, int, int, int]], bounds: tuple[int, int, int, int]) \
+        -> list[tuple[int, int, int, int]]:
+    bounds_x, bounds_y, bounds_width, bounds_height = bounds
+    clipped: list[tuple[int, int, int, int]] = []
+
+    for x, y, width, height in rects:
+        left, top = max(x, bounds_x), max(y, bounds_y)
+        right, bottom = min(x + width, bounds_x + bounds_width), min(y + height, bounds_y + bounds_height)
+        if left < right and top < bottom:
+            clipped.append((left, top, right - left, bottom - top))
+
+    return clipped
@@ -1,16 +1,20 @@
 import collections
-import copy
 
 import game_engine
 
 FREEZE_FRAMES = 8
 
+# Levels with more blocks than this get preprocessed chunk by chunk instead of all at once
+CHUNKED_LEVEL_AREA = 512*512
+# Big levels where entities cover less than this part of the level are not preprocessed at all
+SPARSE_LEVEL_DENSITY = 0.01
+
 
 class Engine:
     def __init__(self, level: game_engine.Level):
         self.level: game_engine.Level = level
 
-        self.static_engine = game_engine.StaticEngine(level.static)
+        self.static_engine = create_static_engine(level)
 
         # Falling takes a bit longer than normal movement (not for the first frame), just for visual effect
         self.snake_is_falling = False
@@ -48,7 +52,8 @@ class Engine:
                 undo = self.undo_stack.pop()
 
                 before = self.level.snake.blocks[0]
-                self.level.snake.blocks = undo.snake
+                # A copy, so the undo entry stays the same when the snake moves again (snapshots share it)
+                self.level.snake.blocks = collections.deque(undo.snake)
                 after = self.level.snake.blocks[0]
 
                 for movement in undo.dynamic_entities:
@@ -90,7 +95,7 @@ class Engine:
         self.last_movement = game_engine.Action.DO_NOTHING
 
         # Saves entity positions to append them to the undo stack if movement happens
-        snake_pos = copy.deepcopy(self.level.snake.blocks)
+        snake_pos = collections.deque(self.level.snake.blocks)
         entity_pos = [game_engine.EntityPosition(entity, entity.x, entity.y) for entity in self.level.dynamic]
         self.current_frame_undo = game_engine.Undo(snake_pos, entity_pos, [])
 
@@ -106,6 +111,13 @@ class Engine:
         if self.movement_happened and action is not game_engine.Action.UNDO_MOVEMENT:
             self.undo_stack.append(self.current_frame_undo)
 
+    # Saves the current state to go back to it later with restore (for replays and seeking in them)
+    def snapshot(self) -> "game_engine.EngineSnapshot":
+        return game_engine.EngineSnapshot(self)
+
+    def restore(self, snapshot: "game_engine.EngineSnapshot") -> None:
+        snapshot.restore(self)
+
     def process_player_movement(self, action: game_engine.Action):
         if action is game_engine.Action.DO_NOTHING:
             return
@@ -195,3 +207,16 @@ def calculate_last_movement(before, after):
     # Should never happen
     else:
         return game_engine.Action.DO_NOTHING
+
+
+# Small levels are preprocessed all at once (or loaded already preprocessed), big ones chunk by chunk
+#  and big levels that are mostly empty get only an index of the entity rectangles
+def create_static_engine(level: game_engine.Level) \
+        -> game_engine.StaticEngine | game_engine.ChunkedStaticEngine | game_engine.RectIndexStaticEngine:
+    if level.compiled_static is not None or level.width*level.height <= CHUNKED_LEVEL_AREA:
+        return game_engine.StaticEngine(level.static, level.compiled_static)
+
+    covered_area = sum(width*height for entity in level.static for _, _, width, height in entity.get_collision_rects())
+    if covered_area < SPARSE_LEVEL_DENSITY*level.width*level.height:
+        return game_engine.RectIndexStaticEngine(level.static)
+    return game_engine.ChunkedStaticEngine(level.static)
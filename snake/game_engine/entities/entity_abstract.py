@@ -72,6 +72,22 @@ class StaticEntity(Entity):
     @abstractmethod
     def get_interact_type(self) -> Entity.InteractType: pass
 
+    # get_xyz_rects functions return the same positions as get_xyz_coords but as (x, y, width, height) rectangles
+    #  so the static engine can preprocess a whole rectangle at once instead of going block by block
+    #  by default every position is its own 1x1 rectangle, entities override these when they know better
+
+    def get_collision_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(x, y, 1, 1) for x, y in self.get_collision_coords()]
+
+    def get_hurt_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(x, y, 1, 1) for x, y in self.get_hurt_coords()]
+
+    def get_electricity_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(x, y, 1, 1) for x, y in self.get_electricity_coords()]
+
+    def get_interact_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(x, y, 1, 1) for x, y in self.get_interact_coords()]
+
 
 # Made of 1x1 blocks, can have any shape
 # Can change position so interactions get checked every frame manually
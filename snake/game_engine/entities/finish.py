@@ -37,6 +37,12 @@ class Finish(StaticEntity):
     def get_interact_coords(self) -> list[tuple[int, int]]:
         return [(self.x + dx, self.y - 1) for dx in range(self.width)]
 
+    def get_collision_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(self.x, self.y, self.width, self.height)]
+
+    def get_interact_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(self.x, self.y - 1, self.width, 1)]
+
     # The finish ends the level when interacted with
     def get_interact_type(self) -> StaticEntity.InteractType:
         return StaticEntity.InteractType.FINISH
@@ -33,6 +33,16 @@ class Wall(StaticEntity):
 
         return electricity_coords
 
+    def get_collision_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(self.x, self.y, self.width, self.height)]
+
+    # Top, bottom, left and right side
+    def get_electricity_rects(self) -> list[tuple[int, int, int, int]]:
+        return [(self.x, self.y - 1, self.width, 1),
+                (self.x, self.y + self.height, self.width, 1),
+                (self.x - 1, self.y, 1, self.height),
+                (self.x + self.width, self.y, 1, self.height)]
+
     # The wall does not hurt the snake
     def get_hurt_coords(self) -> list[tuple[int, int]]:
         return []
@@ -18,3 +18,7 @@ class Level:
             = [entity for entity in entities if isinstance(entity, game_engine.entities.StaticEntity)]
         self.dynamic: list[game_engine.entities.DynamicEntity] \
             = [entity for entity in entities if isinstance(entity, game_engine.entities.DynamicEntity)]
+
+        # Preprocessed static interactions if the level was loaded from a compiled level,
+        #  otherwise the static engine calculates them when it gets created
+        self.compiled_static: game_engine.CompiledStatic | None = None
@@ -0,0 +1,86 @@
+import hashlib
+import struct
+
+import game_engine
+
+# Recorded ticks are the values of the actions, except for this one - the level was restarted
+RESTART = 0
+
+# File header - magic, format version, level number, level hash, number of ticks
+MAGIC = b"HADR"
+VERSION = 1
+HEADER = struct.Struct("<4sBH16sI")
+
+
+# Every action the engine processed (one per tick) while playing a level, to play it again exactly the same way
+#  saved as runs of the same action, most ticks are the same (nothing pressed or waiting for the AI playback)
+class Recording:
+    def __init__(self, level_number: int, level_hash: bytes, ticks: bytearray | None = None):
+        self.level_number = level_number
+        # The recording can only be replayed on the same level
+        self.level_hash = level_hash
+        # One byte per tick
+        self.ticks = ticks if ticks is not None else bytearray()
+
+    # Ticks are the values of the actions or RESTART
+    def record(self, ticks: list[int]) -> None:
+        self.ticks.extend(ticks)
+
+    def save(self, path: str) -> None:
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.level_number, self.level_hash, len(self.ticks)))
+
+        # Runs - the length as a varint (7 bits per byte, the highest bit means more bytes follow) and the tick
+        i = 0
+        while i < len(self.ticks):
+            tick = self.ticks[i]
+            run_end = i + 1
+            while run_end < len(self.ticks) and self.ticks[run_end] == tick:
+                run_end += 1
+
+            length = run_end - i
+            while length >= 0x80:
+                data.append(length & 0x7f | 0x80)
+                length >>= 7
+            data.append(length)
+            data.append(tick)
+            i = run_end
+
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def load(path: str) -> "Recording":
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a recording")
+        magic, version, level_number, level_hash, tick_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a recording (or one of an unsupported version)")
+
+        ticks = bytearray()
+        i = HEADER.size
+        while i < len(data):
+            length, shift = 0, 0
+            while data[i] & 0x80:
+                length |= (data[i] & 0x7f) << shift
+                shift += 7
+                i += 1
+            length |= data[i] << shift
+            ticks.extend(bytes((data[i + 1],))*length)
+            i += 2
+
+        if len(ticks) != tick_count:
+            raise ValueError(f"{path} is damaged, it has {len(ticks)} ticks instead of {tick_count}")
+        return Recording(level_number, level_hash, ticks)
+
+
+# Hash of everything in the level that affects how it plays (dimensions and the entities where they start)
+def hash_level(level: game_engine.Level) -> bytes:
+    description = [f"{level.width};{level.height}", ";".join(f"{x},{y}" for x, y in level.snake.blocks)]
+    for entity in level.static:
+        description.append(f"{type(entity).__name__};{entity.x};{entity.y};{entity.width};{entity.height}")
+    for entity in level.dynamic:
+        description.append(f"{type(entity).__name__};" + ";".join(f"{x},{y}" for x, y in entity.blocks))
+    return hashlib.md5("\n".join(description).encode()).digest()
@@ -0,0 +1,124 @@
+import typing
+
+import utils
+import game_engine
+from game_engine.static_engine import Interaction, InteractionType, InteractionGroup, STATIC_INTERACTIONS, get_flag
+
+
+# Same interactions as the StaticEngine, but answered from an index over the entity rectangles
+#  nothing is preprocessed per position, so a mostly empty level can be as big as it wants
+#  each query is slower than with the StaticEngine, so this is used only for big levels with few entities
+class RectIndexStaticEngine:
+    def __init__(self, static: list[game_engine.entities.StaticEntity]):
+        # Same group ids as in the StaticEngine
+        self._group_hash: typing.Dict[int, InteractionGroup] = {
+            Interaction.WALL.value: InteractionGroup(Interaction.WALL, InteractionType.STATIC),
+            Interaction.HAZARD.value: InteractionGroup(Interaction.HAZARD, InteractionType.STATIC),
+            Interaction.CHARGE.value: InteractionGroup(Interaction.CHARGE, InteractionType.STATIC),
+            Interaction.FINISH.value: InteractionGroup(Interaction.FINISH, InteractionType.STATIC),
+            Interaction.FOOD.value: InteractionGroup(Interaction.FOOD, InteractionType.STATIC)
+        }
+        self.next_group_id = 10
+
+        self.version = 0
+
+        # Same as in the StaticEngine
+        self.food: list[game_engine.entities.Food] = []
+
+        # Rectangles with either a static interaction (group_id 0-9) or a group_id 10+
+        items: list[tuple[tuple[int, int, int, int], int]] = []
+
+        for entity in static:
+            # Food is solid only while it is not eaten, so its collision is decided by its group
+            if entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FOOD:
+                group = InteractionGroup(Interaction.FOOD, InteractionType.FOOD)
+                group.entities = entity
+                self.food.append(entity)
+                items.append(((entity.x, entity.y, 1, 1), self._add_group(group)))
+                continue
+
+            items.extend((rect, Interaction.WALL.value) for rect in entity.get_collision_rects())
+            items.extend((rect, Interaction.HAZARD.value) for rect in entity.get_hurt_rects())
+
+            if entity.charge:
+                items.extend((rect, Interaction.CHARGE.value) for rect in entity.get_electricity_rects())
+
+            if entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FINISH:
+                items.extend((rect, Interaction.FINISH.value) for rect in entity.get_interact_rects())
+
+        for connected_entities in utils.get_connected_conductive_groups(static):
+            group = InteractionGroup(Interaction.CHARGE, InteractionType.CHARGE)
+            group.entities = connected_entities
+            group_id = self._add_group(group)
+            items.extend((rect, group_id) for entity in connected_entities for rect in entity.get_electricity_rects())
+
+        self._index = utils.RectIndex(items)
+
+    def get_interactions(self, x: int, y: int) -> set[Interaction]:
+        flags, group_ids = self._get_ids(x, y)
+        interactions = {interaction for interaction in STATIC_INTERACTIONS if flags & get_flag(interaction)}
+        interactions.update(self._group_hash[group_id].interaction for group_id in group_ids)
+        return interactions
+
+    def get_group_ids(self, x: int, y: int) -> list[int]:
+        flags, group_ids = self._get_ids(x, y)
+        return group_ids + [interaction.value for interaction in STATIC_INTERACTIONS if flags & get_flag(interaction)]
+
+    # Interactions of all positions in the area that have any
+    def get_interactions_in_area(self, x: int, y: int, width: int, height: int) \
+            -> typing.Dict[tuple[int, int], set[Interaction]]:
+        positions: set[tuple[int, int]] = set()
+        for (rect_x, rect_y, rect_width, rect_height), _ in self._index.query_rect(x, y, width, height):
+            positions.update((position_x, position_y)
+                             for position_x in range(max(x, rect_x), min(x + width, rect_x + rect_width))
+                             for position_y in range(max(y, rect_y), min(y + height, rect_y + rect_height)))
+
+        interactions = {position: self.get_interactions(*position) for position in positions}
+        return {position: interaction for position, interaction in interactions.items() if interaction}
+
+    def update_charge(self, x: int, y: int, charge: bool) -> None:
+        for group_id in self._get_ids(x, y)[1]:
+            group = self._group_hash[group_id]
+            if group.type == InteractionType.CHARGE:
+
+                group.interaction = Interaction.CHARGE if charge else Interaction.NOTHING
+                self.version += 1
+                # Propagates charge to all entities in the group
+                for entity in group.entities:
+                    entity.charge = charge
+
+    # The food is solid and interacts with the snake only while its group says so
+    def update_eaten_food(self, x: int, y: int, eaten: bool) -> None:
+        for group_id in self._get_ids(x, y)[1]:
+            group = self._group_hash[group_id]
+
+            if group.type == InteractionType.FOOD and group.entities.eaten != eaten:
+                group.entities.eaten = eaten
+                group.interaction = Interaction.NOTHING if eaten else Interaction.FOOD
+                self.version += 1
+
+    # Nothing is preprocessed, so there is nothing to prepare in advance
+    def prefetch(self, x: int, y: int, width: int, height: int) -> None:
+        pass
+
+    def _add_group(self, group: InteractionGroup) -> int:
+        group_id = self.next_group_id
+        self._group_hash[group_id] = group
+        self.next_group_id += 1
+        return group_id
+
+    # Static interaction flags and group_ids 10+ (in the order of their ids) at the position
+    def _get_ids(self, x: int, y: int) -> tuple[int, list[int]]:
+        flags = 0
+        group_ids: set[int] = set()
+        for value in self._index.query_point(x, y):
+            if value >= 10:
+                group_ids.add(value)
+                # Food that was not eaten yet is solid
+                group = self._group_hash[value]
+                if group.type == InteractionType.FOOD and not group.entities.eaten:
+                    flags |= get_flag(Interaction.WALL)
+            else:
+                flags |= 1 << value
+
+        return flags, sorted(group_ids)
@@ -0,0 +1,57 @@
+import copy
+
+import game_engine
+
+# A keyframe (engine snapshot) gets saved every this many ticks, seeking simulates at most this many ticks
+KEYFRAME_INTERVAL = 600
+
+
+# Plays a recording on its level without showing anything, as fast as possible
+#  keyframes get saved the first time the replay gets to them, so seeking back does not start from zero again
+class Replayer:
+    def __init__(self, level: game_engine.Level, recording: game_engine.Recording):
+        if game_engine.hash_level(level) != recording.level_hash:
+            raise ValueError(f"The recording is not of this level (level {recording.level_number} changed?)")
+
+        self.recording = recording
+        self.level = copy.deepcopy(level)
+        self.engine = game_engine.Engine(self.level)
+
+        # How many ticks of the recording were played
+        self.tick = 0
+
+        # Keyframe i is the state after i*KEYFRAME_INTERVAL ticks, the first one is also used for restarting the level
+        self.keyframes: list[game_engine.EngineSnapshot] = [self.engine.snapshot()]
+
+    def __len__(self) -> int:
+        return len(self.recording.ticks)
+
+    def is_finished(self) -> bool:
+        return self.tick == len(self.recording.ticks)
+
+    # Plays the next tick of the recording
+    def step(self) -> None:
+        code = self.recording.ticks[self.tick]
+        if code == game_engine.RESTART:
+            self.engine.restore(self.keyframes[0])
+        else:
+            self.engine.process_frame(game_engine.Action(code))
+        self.tick += 1
+
+        if self.tick == len(self.keyframes)*KEYFRAME_INTERVAL:
+            self.keyframes.append(self.engine.snapshot())
+
+    # Gets to the state after the given number of ticks, from the nearest keyframe before it when that is closer
+    def seek(self, tick: int) -> None:
+        tick = max(0, min(tick, len(self.recording.ticks)))
+
+        keyframe = min(tick // KEYFRAME_INTERVAL, len(self.keyframes) - 1)
+        if tick < self.tick or keyframe*KEYFRAME_INTERVAL > self.tick:
+            self.engine.restore(self.keyframes[keyframe])
+            self.tick = keyframe*KEYFRAME_INTERVAL
+
+        while self.tick < tick:
+            self.step()
+
+    def run_to_end(self) -> None:
+        self.seek(len(self.recording.ticks))
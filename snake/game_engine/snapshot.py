@@ -0,0 +1,50 @@
+import collections
+
+import game_engine
+
+
+# Everything about the engine that changes while playing, to be able to go back to this moment later
+#  the undo stack is shared with the engine (undo entries do not change once they are on the stack)
+class EngineSnapshot:
+    def __init__(self, engine: game_engine.Engine):
+        level = engine.level
+
+        self.snake = tuple(level.snake.blocks)
+        self.snake_charge = level.snake.charge
+        self.dynamic_positions = [(entity.x, entity.y) for entity in level.dynamic]
+        self.eaten_food = frozenset((entity.x, entity.y) for entity in engine.static_engine.food if entity.eaten)
+
+        self.snake_is_falling = engine.snake_is_falling
+        self.first_frame_falling = engine.first_frame_falling
+        self.falling_frame_countdown = engine.falling_frame_countdown
+        self.level_finish_animation = engine.level_finish_animation
+        self.level_finish_frame_countdown = engine.level_finish_frame_countdown
+        self.level_finished = engine.level_finished
+        self.movement_stopped = engine.movement_stopped
+        self.movement_happened = engine.movement_happened
+        self.last_movement = engine.last_movement
+        self.undo_stack = tuple(engine.undo_stack)
+
+    # Puts the engine (of the same level) back into the state of the snapshot
+    def restore(self, engine: game_engine.Engine) -> None:
+        level = engine.level
+
+        level.snake = game_engine.entities.Snake(self.snake)
+        level.snake.charge = self.snake_charge
+        for entity, (x, y) in zip(level.dynamic, self.dynamic_positions):
+            entity.x, entity.y = x, y
+        for entity in engine.static_engine.food:
+            if entity.eaten != ((entity.x, entity.y) in self.eaten_food):
+                engine.static_engine.update_eaten_food(entity.x, entity.y, not entity.eaten)
+
+        engine.snake_is_falling = self.snake_is_falling
+        engine.first_frame_falling = self.first_frame_falling
+        engine.falling_frame_countdown = self.falling_frame_countdown
+        engine.level_finish_animation = self.level_finish_animation
+        engine.level_finish_frame_countdown = self.level_finish_frame_countdown
+        engine.level_finished = self.level_finished
+        engine.movement_stopped = self.movement_stopped
+        engine.movement_happened = self.movement_happened
+        engine.last_movement = self.last_movement
+        engine.current_frame_undo = None
+        engine.undo_stack = collections.deque(self.undo_stack)
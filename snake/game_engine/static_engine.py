@@ -1,5 +1,4 @@
 import enum
-import collections
 import typing
 
 import utils
@@ -40,8 +39,39 @@ class InteractionGroup:
         self.entities: list[game_engine.entities.StaticEntity] = []
 
 
+# Static interactions (group_id 0-9) are stored in a grid of bit flags, one byte per position
+STATIC_INTERACTIONS = [Interaction.WALL, Interaction.HAZARD, Interaction.CHARGE, Interaction.FINISH]
+# Interactions for every combination of flags, so they don't have to be decoded bit by bit on every query
+FLAG_INTERACTIONS: list[frozenset[Interaction]] = [
+    frozenset(interaction for interaction in STATIC_INTERACTIONS if flags & (1 << interaction.value))
+    for flags in range(1 << (Interaction.FOOD.value + 1))
+]
+
+
+def get_flag(interaction: Interaction) -> int:
+    return 1 << interaction.value
+
+
+# Everything the static engine calculates when a level is loaded, without references to the entities
+#  (entities are referenced by their index in the level static entity list), so it can be saved and loaded
+class CompiledStatic:
+    def __init__(self, x: int, y: int, width: int, height: int, grid: bytearray,
+                 groups: list[tuple[InteractionType, list[int], list[tuple[int, int]]]]):
+        # Position of the top left corner of the grid in the level and its dimensions
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # Static interaction flags, row by row
+        self.grid = grid
+
+        # Groups with id 10+ in the order of their ids - group type, indexes of its entities and its positions
+        self.groups = groups
+
+
 class StaticEngine:
-    def __init__(self, static: list[game_engine.entities.StaticEntity]):
+    def __init__(self, static: list[game_engine.entities.StaticEntity], compiled: CompiledStatic | None = None):
         # What group_id is what interaction, 0-9 are reserved for static behavior (always wall, always death...)
         #  groups with id 10+ are initialized when level is loaded, they change behavior based on electricity
         #  should crash when group_id that does not exist is queried
@@ -54,72 +84,67 @@ class StaticEngine:
         }
         self.next_group_id = 10
 
-        # What group_ids are in what positions
-        #  for example position_hash[3, 4] == [2] would indicate that a hazard is in the position (x=3, y=4)
-        #  should return empty list when position without any interaction is queried
-        self._position_hash: typing.Dict[tuple[int, int], list[int]] = collections.defaultdict(list)
+        # What group_ids 10+ are in what positions
+        #  for example position_hash[3, 4] == [10] would indicate that the group 10 is in the position (x=3, y=4)
+        #  positions without any of these groups are not in the hash
+        self._position_hash: typing.Dict[tuple[int, int], list[int]] = {}
 
-        # Preprocess static interactions
-        collision_positions: set[tuple[int, int]] = set()
-        hazard_positions: set[tuple[int, int]] = set()
-        charge_positions: set[tuple[int, int]] = set()
-        finish_positions: set[tuple[int, int]] = set()
+        # Incremented every time an interaction changes (food eaten, charge changed...)
+        #  so anything derived from the interactions knows when to recalculate
+        self.version = 0
 
-        for entity in static:
-            collision_positions.update(entity.get_collision_coords())
-            hazard_positions.update(entity.get_hurt_coords())
+        # All food of the level, to know what was eaten without going through every static entity
+        self.food: list[game_engine.entities.Food] = []
 
-            if entity.charge:
-                charge_positions.update(entity.get_electricity_coords())
+        if compiled is None:
+            compiled = compile_static(static)
 
-            if entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FOOD:
+        # Static interactions - everything outside the grid has no static interactions
+        self._grid_x = compiled.x
+        self._grid_y = compiled.y
+        self._grid_width = compiled.width
+        self._grid_height = compiled.height
+        self._grid = bytearray(compiled.grid)
+
+        for group_type, entity_indexes, positions in compiled.groups:
+            if group_type is InteractionType.FOOD:
                 # Saves a reference to the food, so it can be removed when eaten
-                food = InteractionGroup(Interaction.FOOD, InteractionType.FOOD)
-                food.entities = entity
-                self._group_hash[self.next_group_id] = food
-                self._position_hash[entity.x, entity.y].append(self.next_group_id)
-                self.next_group_id += 1
-            elif entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FINISH:
-                finish_positions.update(entity.get_interact_coords())
-
-        for x, y in collision_positions:
-            self._position_hash[(x, y)].append(Interaction.WALL.value)
-        for x, y in hazard_positions:
-            self._position_hash[(x, y)].append(Interaction.HAZARD.value)
-        for x, y in charge_positions:
-            self._position_hash[(x, y)].append(Interaction.CHARGE.value)
-        for x, y in finish_positions:
-            self._position_hash[(x, y)].append(Interaction.FINISH.value)
-
-        # Preprocess electricity
-        for connected_entities in utils.get_connected_conductive_groups(static):
-            # Group entities that share the same charge and create interactions groups for them
-            group = InteractionGroup(Interaction.CHARGE, InteractionType.CHARGE)
-            group.entities = connected_entities
-
-            # Gets all positions that the group occupies and adds the group_id to them
-            group_positions: set[tuple[int, int]] = set()
-            for entity in connected_entities:
-                for x, y in entity.get_electricity_coords():
-                    group_positions.add((x, y))
-
-            # Updates the hashes
+                group = InteractionGroup(Interaction.FOOD, InteractionType.FOOD)
+                group.entities = static[entity_indexes[0]]
+                self.food.append(group.entities)
+            else:
+                # Group entities that share the same charge
+                group = InteractionGroup(Interaction.CHARGE, InteractionType.CHARGE)
+                group.entities = [static[i] for i in entity_indexes]
+
             self._group_hash[self.next_group_id] = group
-            for x, y in group_positions:
-                self._position_hash[(x, y)].append(self.next_group_id)
+            for position in positions:
+                self._position_hash.setdefault(position, []).append(self.next_group_id)
             self.next_group_id += 1
 
     # Get interactions at a specific position
     def get_interactions(self, x: int, y: int) -> set[Interaction]:
-        return set([self._group_hash[group_id].interaction for group_id in self._position_hash[(x, y)]])
+        interactions = set(FLAG_INTERACTIONS[self._get_flags(x, y)])
+
+        group_ids = self._position_hash.get((x, y))
+        if group_ids:
+            interactions.update(self._group_hash[group_id].interaction for group_id in group_ids)
+        return interactions
+
+    # Get group_ids at a specific position
+    def get_group_ids(self, x: int, y: int) -> list[int]:
+        flags = self._get_flags(x, y)
+        static_ids = [interaction.value for interaction in STATIC_INTERACTIONS if flags & get_flag(interaction)]
+        return self._position_hash.get((x, y), []) + static_ids
 
     # Call when charge changes at a specific position
     def update_charge(self, x: int, y: int, charge: bool) -> None:
-        for group_id in self._position_hash[(x, y)]:
+        for group_id in self._position_hash.get((x, y), []):
             group = self._group_hash[group_id]
             if group.type == InteractionType.CHARGE:
 
                 group.interaction = Interaction.CHARGE if charge else Interaction.NOTHING
+                self.version += 1
                 # Propagates charge to all entities in the group
                 for entity in group.entities:
                     entity.charge = charge
@@ -128,7 +153,7 @@ class StaticEngine:
     #  eaten == True when eating the food
     #  eaten == False when undoing eating the food
     def update_eaten_food(self, x: int, y: int, eaten: bool) -> None:
-        for group_id in self._position_hash[(x, y)]:
+        for group_id in self._position_hash.get((x, y), []):
             group = self._group_hash[group_id]
 
             if group.type == InteractionType.FOOD:
@@ -137,10 +162,112 @@ class StaticEngine:
                     # Removes the food from the level
                     group.entities.eaten = True
                     group.interaction = Interaction.NOTHING
-                    self._position_hash[(x, y)].remove(Interaction.WALL.value)
+                    self._set_flag(x, y, Interaction.WALL, False)
+                    self.version += 1
                 # If the food was eaten and undoing movement
                 elif not eaten and group.entities.eaten:
                     # Puts the food back in the level
                     group.entities.eaten = False
                     group.interaction = Interaction.FOOD
-                    self._position_hash[(x, y)].append(Interaction.WALL.value)
+                    self._set_flag(x, y, Interaction.WALL, True)
+                    self.version += 1
+
+    # Everything is preprocessed when the level is loaded, nothing to prepare in advance
+    def prefetch(self, x: int, y: int, width: int, height: int) -> None:
+        pass
+
+    def _get_flags(self, x: int, y: int) -> int:
+        x -= self._grid_x
+        y -= self._grid_y
+        if 0 <= x < self._grid_width and 0 <= y < self._grid_height:
+            return self._grid[y*self._grid_width + x]
+        return 0
+
+    def _set_flag(self, x: int, y: int, interaction: Interaction, value: bool) -> None:
+        i = (y - self._grid_y)*self._grid_width + (x - self._grid_x)
+        if value:
+            self._grid[i] |= get_flag(interaction)
+        else:
+            self._grid[i] &= ~get_flag(interaction)
+
+
+# Preprocesses static interactions of the entities
+#  static interactions get rasterized a whole rectangle at once, so this takes time proportional to
+#  the number of entities (and their smaller side) instead of the area they cover
+def compile_static(static: list[game_engine.entities.StaticEntity]) -> CompiledStatic:
+    collision_rects: list[tuple[int, int, int, int]] = []
+    hazard_rects: list[tuple[int, int, int, int]] = []
+    charge_rects: list[tuple[int, int, int, int]] = []
+    finish_rects: list[tuple[int, int, int, int]] = []
+    groups: list[tuple[InteractionType, list[int], list[tuple[int, int]]]] = []
+
+    for i, entity in enumerate(static):
+        collision_rects.extend(entity.get_collision_rects())
+        hazard_rects.extend(entity.get_hurt_rects())
+
+        if entity.charge:
+            charge_rects.extend(entity.get_electricity_rects())
+
+        if entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FOOD:
+            groups.append((InteractionType.FOOD, [i], [(entity.x, entity.y)]))
+        elif entity.get_interact_type() == game_engine.entities.StaticEntity.InteractType.FINISH:
+            finish_rects.extend(entity.get_interact_rects())
+
+    # Preprocess electricity
+    indexes = {id(entity): i for i, entity in enumerate(static)}
+    for connected_entities in utils.get_connected_conductive_groups(static):
+        # Gets all positions that the group occupies (only the outline of the entities)
+        group_positions: set[tuple[int, int]] = set()
+        for entity in connected_entities:
+            for x, y, width, height in entity.get_electricity_rects():
+                group_positions.update((x + dx, y + dy) for dx in range(width) for dy in range(height))
+
+        groups.append((InteractionType.CHARGE, [indexes[id(entity)] for entity in connected_entities],
+                       sorted(group_positions)))
+
+    # The grid only needs to cover rectangles with static interactions
+    layers = [(Interaction.WALL, collision_rects), (Interaction.HAZARD, hazard_rects),
+              (Interaction.CHARGE, charge_rects), (Interaction.FINISH, finish_rects)]
+    rects = [rect for _, interaction_rects in layers for rect in interaction_rects if rect[2] > 0 and rect[3] > 0]
+    if not rects:
+        return CompiledStatic(0, 0, 0, 0, bytearray(), groups)
+
+    min_x = min(x for x, _, _, _ in rects)
+    min_y = min(y for _, y, _, _ in rects)
+    width = max(x + rect_width for x, _, rect_width, _ in rects) - min_x
+    height = max(y + rect_height for _, y, _, rect_height in rects) - min_y
+
+    return CompiledStatic(min_x, min_y, width, height, rasterize(layers, min_x, min_y, width, height), groups)
+
+
+# Every interaction is rasterized into its own layer, then the layers are combined into one grid of flags
+#  (as big integers, so the whole grid gets combined at once)
+def rasterize(layers: list[tuple[Interaction, list[tuple[int, int, int, int]]]],
+              x: int, y: int, width: int, height: int) -> bytearray:
+    grid = 0
+    for interaction, interaction_rects in layers:
+        if interaction_rects:
+            layer = bytearray(width*height)
+            fill_rects(layer, interaction_rects, get_flag(interaction), x, y, width)
+            grid |= int.from_bytes(layer, "little")
+
+    return bytearray(grid.to_bytes(width*height, "little"))
+
+
+# Sets all positions in the rectangles to value, with one slice assignment per row or column (whichever is fewer)
+def fill_rects(layer: bytearray, rects: list[tuple[int, int, int, int]], value: int,
+               grid_x: int, grid_y: int, grid_width: int) -> None:
+    for x, y, width, height in rects:
+        if width <= 0 or height <= 0:
+            continue
+
+        start = (y - grid_y)*grid_width + (x - grid_x)
+        if width <= height:
+            # Columns - every grid_width-th position from the top of the column
+            column = bytes([value])*height
+            for dx in range(width):
+                layer[start + dx:start + dx + height*grid_width:grid_width] = column
+        else:
+            row = bytes([value])*width
+            for dy in range(height):
+                layer[start + dy*grid_width:start + dy*grid_width + width] = row
@@ -0,0 +1,78 @@
+import bisect
+
+import game_engine
+
+# A checkpoint (engine snapshot) gets saved every this many ticks
+CHECKPOINT_INTERVAL = 60
+# Older checkpoints get thinned out - checkpoints d ticks before the end are at most d/CHECKPOINT_SPACING ticks apart
+#  so the recent past stays quick to get to, seeking further back simulates at most a fixed part of the way back
+#  and the number of checkpoints grows only with the logarithm of the length of the session
+CHECKPOINT_SPACING = 8
+
+
+# History of everything the engine did, to get back to any past tick (for debugging)
+#  every tick is one byte (the action or game_engine.RESTART like in recordings) and every now and then a checkpoint
+#  seeking restores the last checkpoint before the tick (found by bisection) and simulates the ticks after it
+#  (going back with the undo stack is not used, undo entries exist only for ticks when something moved)
+class Timeline:
+    def __init__(self, engine: game_engine.Engine):
+        self.ticks = bytearray()
+
+        # Sorted by the tick they were saved after, the first one is the start of the level (used for restarts)
+        self.checkpoint_ticks: list[int] = [0]
+        self.checkpoints: list[game_engine.EngineSnapshot] = [engine.snapshot()]
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    # The engine is in the state after the ticks, several ticks are recorded at once when the state jumped
+    #  (like the AI playback jumping back) - a checkpoint is saved then, the ticks in between were not simulated
+    def record(self, ticks: list[int], engine: game_engine.Engine) -> None:
+        self.ticks.extend(ticks)
+
+        if len(ticks) > 1 or len(self.ticks) - self.checkpoint_ticks[-1] >= CHECKPOINT_INTERVAL:
+            self.checkpoint_ticks.append(len(self.ticks))
+            self.checkpoints.append(engine.snapshot())
+            self.thin()
+
+    # Goes from the newest checkpoint to the oldest and drops the ones that are not needed for the spacing
+    #  the first checkpoint is always kept (restarts go back to it)
+    def thin(self) -> None:
+        end = len(self.ticks)
+        keep = [len(self.checkpoints) - 1]
+        for i in range(len(self.checkpoints) - 2, 0, -1):
+            newer = self.checkpoint_ticks[keep[-1]]
+            # Without this checkpoint the gap would be from the newer one to the one before this one
+            if newer - self.checkpoint_ticks[i - 1] > get_max_gap(end - newer):
+                keep.append(i)
+        keep.append(0)
+        keep.reverse()
+
+        self.checkpoint_ticks = [self.checkpoint_ticks[i] for i in keep]
+        self.checkpoints = [self.checkpoints[i] for i in keep]
+
+    # Puts the engine into the state after the given number of ticks
+    def seek(self, engine: game_engine.Engine, tick: int) -> None:
+        tick = max(0, min(tick, len(self.ticks)))
+
+        i = bisect.bisect_right(self.checkpoint_ticks, tick) - 1
+        engine.restore(self.checkpoints[i])
+
+        for code in self.ticks[self.checkpoint_ticks[i]:tick]:
+            if code == game_engine.RESTART:
+                engine.restore(self.checkpoints[0])
+            else:
+                engine.process_frame(game_engine.Action(code))
+
+    # Forgets everything after the tick (when the game continues from there)
+    def truncate(self, tick: int) -> None:
+        del self.ticks[tick:]
+
+        i = bisect.bisect_right(self.checkpoint_ticks, tick)
+        del self.checkpoint_ticks[i:]
+        del self.checkpoints[i:]
+
+
+# How far apart checkpoints this many ticks before the end can be
+def get_max_gap(distance: int) -> int:
+    return max(CHECKPOINT_INTERVAL, distance // CHECKPOINT_SPACING)
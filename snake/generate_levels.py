@@ -0,0 +1,56 @@
+import argparse
+import os
+
+import utils
+import ai
+
+
+# Saves the levels numbered from 1 (like in the resources directory, so they can be copied there and played)
+def save_levels(directory: str, levels: list[tuple]) -> None:
+    os.makedirs(directory, exist_ok=True)
+
+    for number, (level, offsetx, offsety, seed) in enumerate(levels, 1):
+        path = f"{directory}/{number}.hadik"
+        utils.save_level(path, level, offsetx, offsety)
+        print(f"{path}: {level.width}x{level.height}, seed {seed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", metavar="DIR",
+                        help="Where to save the levels")
+    parser.add_argument("--corpus", nargs="+", choices=list(utils.CORPORA),
+                        help=f"Generates the corpora into DIR/<corpus> ({', '.join(utils.CORPORA)})")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"), default=(64, 32),
+                        help="Level dimensions (default: 64 32)")
+    parser.add_argument("--wall-density", type=float, default=0.2,
+                        help="Part of the level covered by walls (default: 0.2)")
+    parser.add_argument("--layout", choices=utils.LAYOUTS, default="terrain",
+                        help="Columns of walls only or with floating platforms (default: terrain)")
+    parser.add_argument("--food", type=int, default=5,
+                        help="How much food there is (default: 5)")
+    parser.add_argument("--finish", choices=utils.FINISH_PLACEMENTS, default="end",
+                        help="Where the finish is (default: end)")
+    parser.add_argument("--count", type=int, default=1,
+                        help="How many levels to generate (default: 1)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the first level, the same seed always generates the same levels (default: 0)")
+    parser.add_argument("--no-check", action="store_true",
+                        help="Does not check if the AI can solve the levels")
+    args = parser.parse_args()
+
+    # Levels the AI can not solve get generated again with the next seed
+    is_solvable = (lambda level: True) if args.no_check else ai.is_solvable
+
+    if args.corpus:
+        for name in args.corpus:
+            save_levels(f"{args.directory}/{name}", utils.generate_corpus(name, args.seed, is_solvable))
+    else:
+        parameters = utils.LevelParameters(*args.size, args.wall_density, args.layout, args.food, args.finish)
+
+        levels = []
+        seed = args.seed
+        for _ in range(args.count):
+            levels.append(utils.generate_solvable_level(parameters, seed, is_solvable))
+            seed = levels[-1][3] + 1
+        save_levels(args.directory, levels)
@@ -1,10 +1,25 @@
 import tkinter
 import time
+import math
 import collections
 import argparse
+import typing
 
 import scenes
 import utils
+import game_engine
+
+# When the machine can not keep up, at most this many simulation ticks run before a frame gets rendered
+#  the leftover time is dropped so the game slows down instead of freezing
+MAX_TICKS_PER_FRAME = 5
+
+# Key presses waiting to be processed, one gets processed every simulation tick
+#  older key presses get dropped when someone mashes the keyboard faster than the game can process them
+INPUT_QUEUE_SIZE = 8
+# How many input latency samples are collected before the percentiles get reported
+INPUT_LATENCY_REPORT_SAMPLES = 50
+# How often the frame timing HUD gets refreshed when nothing else is being rendered (in seconds)
+PERF_HUD_REFRESH_TIME = 0.5
 
 
 class SnakeApplication:
@@ -12,8 +27,21 @@ class SnakeApplication:
                  window_size: int = 700,
                  force_fullscreen: bool = False,
                  force_autoplay: bool = False,
-                 debug: bool = False):
+                 debug: bool = False,
+                 tick_rate: int = 60,
+                 render_rate: int = 60,
+                 measure_input_latency: bool = False,
+                 perf_log: str | None = None,
+                 profile_dir: str | None = None,
+                 allocation_log: str | None = None,
+                 ai_telemetry_log: str | None = None,
+                 record_dir: str | None = None,
+                 replay_path: str | None = None):
         self.debug = debug
+        # Where to save what the AI did in every attempt at a level
+        self.ai_telemetry_log = ai_telemetry_log
+        # Where to save the recordings of played levels
+        self.record_dir = record_dir
 
         # Player data
         self.player_data: utils.PlayerData = utils.PlayerData()
@@ -23,6 +51,10 @@ class SnakeApplication:
         if force_autoplay:
             self.player_data.autoplay = True
 
+        # Levels that exist in the resources directory
+        self.level_index: utils.LevelIndex = utils.LevelIndex()
+        self.level_index.load()
+
         # Application output
         self.root = tkinter.Tk()
         self.root.title("Snake")
@@ -36,91 +68,230 @@ class SnakeApplication:
         # Running scenes that process user input and display on canvas
         #  main menu is the root and should never be popped
         self.scenes: collections.deque[scenes.Scene] = collections.deque([scenes.MainMenu(self.canvas)])
+        # Replays start right away, leaving the level goes back to the main menu
+        if replay_path:
+            recording = game_engine.Recording.load(replay_path)
+            self.scenes.append(scenes.Game(self.canvas, recording.level_number, False, self.debug, replay=recording))
 
-        # Screen resize manager
+        # Screen resize manager - layout is recalculated only when the canvas gets resized
         self.paddingx = 0
         self.paddingy = 0
         self.screen_size = window_size
         self.last_x = window_size
         self.last_y = window_size
-
-        # Fps limiter (60 FPS)
-        self.last_frame_time = time.monotonic()
+        # Resize events come in bursts while dragging the window, only the last one gets processed
+        self.resize_pending = False
+
+        # What was on the screen last render, to skip rendering when nothing changed
+        self.last_drawn_geometry: tuple[float, float, int] | None = None
+        self.last_drawn_scenes: list[scenes.Scene] = []
+
+        # Fixed timestep game loop - the simulation always runs tick_rate times per second
+        #  and rendering happens at most render_rate times per second, independent of each other
+        self.tick_time = 1 / tick_rate
+        self.render_time = 1 / render_rate
+        self.last_frame_time = time.perf_counter()
+        self.last_render_time = self.last_frame_time
+        # Simulation time that has passed but was not processed yet
+        self.accumulator = 0.0
+        # Rendering is skipped when there is nothing new to show or when the simulation is behind
+        self.ticks_since_render = 0
+        self.render_skipped = False
 
         # For doing pretty transitions
         self.first_half_of_transition_done = False
-
-        # Key press handler
-        self.last_key_pressed: scenes.KeyboardInput | None = None
-
-        # Used only to stop the resize manager
+        # Levels get prepared in the background while the transition animation is playing
+        self.level_preloader = scenes.LevelPreloader()
+
+        # Key press handler - key presses with the time they arrived at
+        self.key_queue: collections.deque[tuple[scenes.KeyboardInput, float]] \
+            = collections.deque(maxlen=INPUT_QUEUE_SIZE)
+
+        # Measures the time from a key press to the frame that shows its result
+        self.measure_input_latency = measure_input_latency
+        self.keys_not_displayed: list[float] = []
+        self.input_latencies: list[float] = []
+
+        # Measures where the time of every frame goes, the HUD is toggled in debug mode
+        self.frame_timer = utils.FrameTimer(perf_log)
+        self.show_perf_hud = False
+        self.perf_hud_dirty = False
+        self.last_perf_hud_time = 0.0
+        # When the next frame should start, to know how late it was
+        self.next_frame_time: float | None = None
+
+        # Profiling is started and stopped with a key, only when the application runs in the profiling mode
+        self.profiler: utils.Profiler | None = utils.Profiler(profile_dir) if profile_dir else None
+        # Tracks memory allocations of every frame, only in the allocation tracking mode
+        self.allocation_tracker: utils.AllocationTracker | None = None
+        if allocation_log:
+            self.allocation_tracker = utils.AllocationTracker(allocation_log)
+            self.allocation_tracker.start()
+
+        # Used only to stop the main event loop
         self.is_running = False
 
     # Entry point - blocking the main thread until the application is closed
     def run(self) -> None:
         self.canvas.pack(fill="both", expand=True)
         self.canvas.bind_all("<Key>", self.on_key_press)
+        self.canvas.bind("<Configure>", self.on_resize)
 
         self.is_running = True
-        self.start_resize_manager()
         self.process()
 
         self.canvas.mainloop()
 
-    # Resizes objects to fit the screen and manages fullscreen
-    def start_resize_manager(self):
-        x = self.canvas.winfo_width()
-        y = self.canvas.winfo_height()
+        # The window can get closed in the middle of a level, its recording gets saved anyway
+        for scene in self.scenes:
+            if isinstance(scene, scenes.Game):
+                scene.save_recording()
+
+        # The last save might still be getting written
+        self.player_data.close()
+        self.frame_timer.close()
+        if self.profiler is not None:
+            self.profiler.stop()
+        if self.allocation_tracker is not None:
+            self.allocation_tracker.stop()
+
+    # Called by tkinter whenever the canvas changes size (also when fullscreen is toggled)
+    def on_resize(self, event):
+        self.last_x = event.width
+        self.last_y = event.height
+
+        # Coalesces all resize events until tkinter is idle
+        if not self.resize_pending:
+            self.resize_pending = True
+            self.canvas.after_idle(self.apply_resize)
 
-        if x != self.last_x or y != self.last_y:
-            self.screen_size = min(x, y)
+    # Resizes objects to fit the screen and manages fullscreen
+    def apply_resize(self):
+        if self.profiler is not None:
+            with self.profiler.profile("Resize"):
+                self.resize()
+        else:
+            self.resize()
 
-            if x >= y:
-                (self.paddingx) = (x - self.screen_size) / 2
-                self.paddingy = 0
-            else:
-                self.paddingx = 0
-                self.paddingy = (y - self.screen_size) / 2
+    def resize(self):
+        self.resize_pending = False
+        x, y = self.last_x, self.last_y
 
-            self.last_x = x
-            self.last_y = y
+        self.screen_size = min(x, y)
+        if x >= y:
+            self.paddingx = (x - self.screen_size) / 2
+            self.paddingy = 0
+        else:
+            self.paddingx = 0
+            self.paddingy = (y - self.screen_size) / 2
 
         # If fullscreen was toggled from the window and not from the settings menu
-        fullscreen = self.root.attributes("-fullscreen")
-        if fullscreen and not self.player_data.fullscreen:
-            self.player_data.fullscreen = True
-            self.player_data.save()
-        elif not fullscreen and self.player_data.fullscreen:
-            self.player_data.fullscreen = False
+        fullscreen = bool(self.root.attributes("-fullscreen"))
+        if fullscreen != self.player_data.fullscreen:
+            self.player_data.fullscreen = fullscreen
             self.player_data.save()
 
-        if self.is_running:
-            self.canvas.after(100, self.start_resize_manager)
-
     # Main event loop
     def process(self):
+        # The whole frame is profiled under the scene that was on top when it started
+        if self.profiler is not None:
+            with self.profiler.profile(type(self.scenes[-1]).__name__):
+                self.run_frame()
+        else:
+            self.run_frame()
+
+    def run_frame(self):
+        current_time = time.perf_counter()
+        self.accumulator += current_time - self.last_frame_time
+        self.last_frame_time = current_time
+
+        self.frame_timer.start_frame()
+        if self.allocation_tracker is not None:
+            self.allocation_tracker.begin_frame(type(self.scenes[-1]).__name__)
+        if self.next_frame_time is not None:
+            self.frame_timer.add("slack", max(0.0, current_time - self.next_frame_time))
+
+        # Runs as many simulation ticks as the time that passed requires
+        ticks = 0
+        while self.accumulator >= self.tick_time and ticks < MAX_TICKS_PER_FRAME:
+            self.process_tick()
+            self.accumulator -= self.tick_time
+            ticks += 1
+
+            # The application was closed during the tick
+            if not self.is_running:
+                return
+        self.ticks_since_render += ticks
+
+        # Too far behind, drops the time that could not be simulated and skips rendering this frame
+        #  (never two frames in a row, so the screen does not freeze on a slow machine)
+        behind = self.accumulator >= self.tick_time
+        if behind:
+            self.accumulator %= self.tick_time
+        skip_render = behind and not self.render_skipped
+        self.render_skipped = skip_render
+
+        # Renders only when something was simulated since the last render and a frame is due
+        if self.ticks_since_render and not skip_render \
+                and current_time - self.last_render_time >= self.render_time - self.tick_time / 2:
+            with self.frame_timer.measure("display_frame"):
+                self.display_scenes()
+            self.last_render_time = current_time
+            self.ticks_since_render = 0
+
+        # The frame timing HUD changes even when the scenes do not (drawing the scenes redraws it as well)
+        if self.perf_hud_dirty or self.show_perf_hud \
+                and current_time - self.last_perf_hud_time >= PERF_HUD_REFRESH_TIME:
+            with self.frame_timer.measure("display_frame"):
+                self.display_perf_hud()
+                with self.frame_timer.measure("update"):
+                    self.canvas.update()
+
+        self.frame_timer.end_frame()
+        if self.allocation_tracker is not None:
+            self.allocation_tracker.end_frame()
+
+        # Schedule the next update when the next tick is due (rounded up, waking up early would do nothing)
+        delay = math.ceil(max(0.0, self.tick_time - self.accumulator) * 1000)
+        self.next_frame_time = time.perf_counter() + delay / 1000
+        self.canvas.after(delay, self.process)
+
+    # Processes one simulation tick of the top most scene
+    def process_tick(self):
         top_scene = self.scenes[-1]
-        key_pressed = self.last_key_pressed
-        self.last_key_pressed = None
+        key_pressed = None
+        with self.frame_timer.measure("input"):
+            if self.key_queue:
+                key_pressed, key_time = self.key_queue.popleft()
+                if self.measure_input_latency:
+                    self.keys_not_displayed.append(key_time)
 
         # Sends user input to the top most scene
-        top_scene.process_frame(key_pressed)
+        with self.frame_timer.measure("process_frame"):
+            top_scene.process_frame(key_pressed)
+        # The AI is measured on its own
+        if isinstance(top_scene, scenes.Game):
+            self.frame_timer.add("ai", top_scene.last_ai_time)
+            self.frame_timer.add("process_frame", -top_scene.last_ai_time)
+        # Menus only change on key presses, scenes that change on their own mark themselves dirty
+        if key_pressed is not None:
+            top_scene.dirty = True
+
+        # Prepares the highlighted level in advance, it will probably get started
+        if isinstance(top_scene, scenes.LevelSelect) and top_scene.is_running and top_scene.is_selected_unlocked():
+            self.level_preloader.preload(top_scene.level_number(), self.player_data.autoplay)
 
-        if top_scene.is_running:
-            self.display_scenes()
         # Process exit message
-        else:
+        if not top_scene.is_running:
             message = top_scene.exit_message
 
             if isinstance(top_scene, scenes.MainMenu):
                 # Start new game
                 if message == 1:
-                    self.append_with_transition(top_scene,
-                                                scenes.Game(self.canvas, 1, self.player_data.autoplay, self.debug),
-                                                False, 1)
+                    self.append_with_transition(top_scene, lambda: self.create_game(1), False, 1)
                 # Open level select menu
                 if message == 2:
-                    self.append_with_transition(top_scene, scenes.LevelSelect(self.canvas, self.player_data), True)
+                    self.append_with_transition(top_scene, lambda: scenes.LevelSelect(self.canvas, self.player_data, self.level_index), True)
                 # Open settings menu
                 if message == 3:
                     top_scene.is_running = True
@@ -136,17 +307,20 @@ class SnakeApplication:
                     top_scene.is_running = True
                     self.scenes.append(scenes.LevelMenu(self.canvas))
                 # Start next level
-                elif 0 < message < 16:
+                elif 0 < message < 16 and self.level_index.has_level(message + 1):
+                    top_scene.save_recording()
                     self.player_data.levels[message + 1] = True
                     self.player_data.save()
-                    self.next_level_with_transition(top_scene, message + 1, self.player_data.autoplay, self.debug)
-                # Does not start next level after finishing the game
-                elif message == 16:
-                    self.player_data.levels[message + 1] = True
+                    self.next_level_with_transition(top_scene, message + 1)
+                # Does not start next level after finishing the game (or the last level there is)
+                elif 0 < message < 17:
+                    top_scene.save_recording()
                     self.player_data.save()
                     self.pop_with_transition(top_scene)
                 # Exit level
                 elif message == 17:
+                    top_scene.write_ai_telemetry(False)
+                    top_scene.save_recording()
                     self.pop_with_transition(top_scene)
 
             elif isinstance(top_scene, scenes.LevelMenu):
@@ -175,9 +349,7 @@ class SnakeApplication:
                     self.pop_with_transition(top_scene)
                 # Start chosen level
                 elif 0 < message < 17:
-                    self.append_with_transition(top_scene,
-                                                scenes.Game(self.canvas, message, self.player_data.autoplay, self.debug),
-                                                False, message)
+                    self.append_with_transition(top_scene, lambda: self.create_game(message), False, message)
 
             elif isinstance(top_scene, scenes.Settings):
                 # Save settings
@@ -191,18 +363,37 @@ class SnakeApplication:
                 # Exit application
                 if message == 0:
                     self.is_running = False
+                    self.report_input_latency()
+                    self.level_preloader.shutdown()
+                    self.frame_timer.close()
                     self.root.destroy()
 
-        # Calculate delay to cap at 60 FPS
-        current_time = time.monotonic()
-        elapsed_time = current_time - self.last_frame_time
-        delay = max(0, int((1 / 60 - elapsed_time) * 1000))
+    def display_scenes(self):
+        # Scenes from the top most until there is a non-transparent scene that will take up the whole screen
+        scenes_to_draw: list[scenes.Scene] = []
+        for scene in reversed(self.scenes):
+            scenes_to_draw.append(scene)
+            if not scene.transparent:
+                break
+        scenes_to_draw.reverse()
 
-        # Schedule next frame update
-        self.last_frame_time = current_time
-        self.canvas.after(delay, self.process)
+        geometry = (self.paddingx, self.paddingy, self.screen_size)
+        if geometry == self.last_drawn_geometry and scenes_to_draw == self.last_drawn_scenes:
+            # Nothing visible changed since the last render, the canvas already shows the right thing
+            if not any(scene.dirty for scene in scenes_to_draw):
+                return
+
+            # Only the top scene changed and it can update its own items, the scenes below stay frozen on the canvas
+            top_scene = scenes_to_draw[-1]
+            if top_scene.incremental and not any(scene.dirty for scene in scenes_to_draw[:-1]):
+                top_scene.update_frame(self.paddingx, self.paddingy, self.screen_size)
+                top_scene.dirty = False
+                self.finish_display()
+                return
+
+        self.last_drawn_geometry = geometry
+        self.last_drawn_scenes = scenes_to_draw
 
-    def display_scenes(self):
         # Prepares the canvas for the new frame - creates a white square in the middle of the canvas
         self.canvas.delete("all")
         self.canvas.create_rectangle(self.paddingx,
@@ -211,33 +402,73 @@ class SnakeApplication:
                                      self.paddingy + self.screen_size,
                                      fill="white")
 
-        # Pops from scenes stack until there is a non-transparent scene that will take up the whole screen
-        scenes_to_draw = collections.deque()
-        while True:
-            scene = self.scenes.pop()
-            scenes_to_draw.append(scene)
-            if not scene.transparent:
-                break
-
-        # Displays scenes in reverse order and adds them back to the scenes stack
-        while scenes_to_draw:
-            scene = scenes_to_draw.pop()
+        # Displays scenes from the bottom one up
+        for scene in scenes_to_draw:
             scene.display_frame(self.paddingx, self.paddingy, self.screen_size)
-            self.scenes.append(scene)
-
-        self.canvas.update()
+            scene.dirty = False
+
+        self.finish_display()
+
+    # Shows the new frame on the screen
+    def finish_display(self):
+        self.display_perf_hud()
+        with self.frame_timer.measure("update"):
+            self.canvas.update()
+
+        if self.keys_not_displayed:
+            self.record_input_latency()
+
+    # Percentiles of every frame phase over the last frames, on top of everything else
+    def display_perf_hud(self):
+        self.canvas.delete("perf_hud")
+        self.perf_hud_dirty = False
+        if not self.show_perf_hud:
+            return
+
+        lines = ["Frame phases (ms): p50 / p95 / p99"]
+        for phase in utils.PHASES:
+            p50, p95, p99 = self.frame_timer.get_percentiles(phase)
+            lines.append(f"{phase}: {p50 * 1000:.2f} / {p95 * 1000:.2f} / {p99 * 1000:.2f}")
+
+        self.canvas.create_text(self.paddingx + self.screen_size * 0.02, self.paddingy + self.screen_size * 0.02,
+                                text="\n".join(lines), anchor="nw", fill="red", tags="perf_hud",
+                                font=scenes.Scene.get_font(self.screen_size, 45))
+        self.last_perf_hud_time = time.perf_counter()
+
+    # Key presses processed since the last render are now on the screen
+    def record_input_latency(self):
+        current_time = time.perf_counter()
+        self.input_latencies.extend(current_time - key_time for key_time in self.keys_not_displayed)
+        self.keys_not_displayed.clear()
+
+        if len(self.input_latencies) >= INPUT_LATENCY_REPORT_SAMPLES:
+            self.report_input_latency()
+
+    def report_input_latency(self):
+        if not self.input_latencies:
+            return
+
+        p50, p95, p99 = utils.percentiles(self.input_latencies, (50, 95, 99))
+        print(f"Input latency ({len(self.input_latencies)} key presses): "
+              f"p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms")
+        self.input_latencies.clear()
 
     # Append scene to the scenes stack but with a transition
-    def append_with_transition(self, current: scenes.Scene, new: scenes.Scene, generic: bool, level_number: int | None = None):
+    #  the new scene is only created when the screen is covered, while the level intro is shown
+    def append_with_transition(self, current: scenes.Scene, create_new: typing.Callable[[], scenes.Scene],
+                               generic: bool, level_number: int | None = None):
         if self.first_half_of_transition_done:
             self.first_half_of_transition_done = False
             current.is_running = True
 
-            self.scenes.append(new)
+            # Loading the level counts towards the level intro time
+            intro_start = time.monotonic()
+            self.scenes.append(create_new())
             if generic:
                 self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.GENERIC_SECOND_HALF))
             else:
-                self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_SECOND_HALF, level_number))
+                self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_SECOND_HALF,
+                                                     level_number, intro_start))
 
         else:
             self.first_half_of_transition_done = True
@@ -245,6 +476,7 @@ class SnakeApplication:
             if generic:
                 self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.GENERIC_FIRST_HALF))
             else:
+                self.level_preloader.preload(level_number, self.player_data.autoplay)
                 self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_FIRST_HALF, level_number))
 
     # Pops scene from the scenes stack but with a transition
@@ -261,39 +493,78 @@ class SnakeApplication:
             self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.GENERIC_FIRST_HALF))
 
     # Something between pop_with_transition and append_with_transition
-    def next_level_with_transition(self, current: scenes.Scene, level_number: int, autplay: bool, debug: bool):
+    def next_level_with_transition(self, current: scenes.Scene, level_number: int):
         if self.first_half_of_transition_done:
             self.first_half_of_transition_done = False
             current.is_running = True
 
+            # Loading the level counts towards the level intro time
+            intro_start = time.monotonic()
             self.scenes.pop()
-            self.scenes.append(scenes.Game(self.canvas, level_number, autplay, debug))
-            self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_SECOND_HALF, level_number))
+            self.scenes.append(self.create_game(level_number))
+            self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_SECOND_HALF,
+                                                 level_number, intro_start))
 
         else:
             self.first_half_of_transition_done = True
+            self.level_preloader.preload(level_number, self.player_data.autoplay)
             self.scenes.append(scenes.Transition(self.canvas, scenes.Transition.Type.START_LEVEL_FIRST_HALF, level_number))
 
+    # Creates the game from the level prepared in the background
+    def create_game(self, level_number: int) -> scenes.Game:
+        autoplay = self.player_data.autoplay
+        return scenes.Game(self.canvas, level_number, autoplay, self.debug,
+                           self.level_preloader.take(level_number, autoplay), self.ai_telemetry_log,
+                           self.record_dir)
+
     def on_key_press(self, event):
         key = event.keysym
-        self.last_key_pressed = None
+        key_pressed = None
 
         if key == "Escape":
-            self.last_key_pressed = scenes.KeyboardInput.ESC
+            key_pressed = scenes.KeyboardInput.ESC
         elif key == "Return":
-            self.last_key_pressed = scenes.KeyboardInput.ENTER
+            key_pressed = scenes.KeyboardInput.ENTER
         elif key == "Up":
-            self.last_key_pressed = scenes.KeyboardInput.UP
+            key_pressed = scenes.KeyboardInput.UP
         elif key == "Down":
-            self.last_key_pressed = scenes.KeyboardInput.DOWN
+            key_pressed = scenes.KeyboardInput.DOWN
         elif key == "Left":
-            self.last_key_pressed = scenes.KeyboardInput.LEFT
+            key_pressed = scenes.KeyboardInput.LEFT
         elif key == "Right":
-            self.last_key_pressed = scenes.KeyboardInput.RIGHT
+            key_pressed = scenes.KeyboardInput.RIGHT
+        elif key == "f":
+            key_pressed = scenes.KeyboardInput.PLAYBACK_SPEED
         elif key == "n" and self.debug:
-            self.last_key_pressed = scenes.KeyboardInput.UNDO
+            key_pressed = scenes.KeyboardInput.UNDO
         elif key == "m" and self.debug:
-            self.last_key_pressed = scenes.KeyboardInput.STOP_MOVEMENT
+            key_pressed = scenes.KeyboardInput.STOP_MOVEMENT
+        elif key == "i" and self.debug:
+            key_pressed = scenes.KeyboardInput.TOGGLE_DEBUG_INFO
+        elif key == "g" and self.debug:
+            key_pressed = scenes.KeyboardInput.TOGGLE_DEBUG_GROUPS
+        elif key == "r" and self.debug:
+            key_pressed = scenes.KeyboardInput.TOGGLE_DEBUG_REACH
+        elif key == "t" and self.debug:
+            key_pressed = scenes.KeyboardInput.TOGGLE_TIMELINE
+        # The frame timing HUD is drawn by the application, not by the scenes
+        elif key == "p" and self.debug:
+            self.show_perf_hud = not self.show_perf_hud
+            self.perf_hud_dirty = True
+        # Starts and stops a profiling capture
+        elif key == "c" and self.profiler is not None:
+            self.profiler.toggle()
+
+        if key_pressed is not None:
+            self.key_queue.append((key_pressed, time.perf_counter()))
+
+
+# Type of arguments that something gets divided by
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
 
 
 if __name__ == "__main__":
@@ -306,7 +577,30 @@ if __name__ == "__main__":
                         help="Starts the game with autoplay")
     parser.add_argument("-d", "--debug", action="store_true",
                         help="Enables debug features")
+    parser.add_argument("-t", "--tick-rate", type=positive_int, default=60,
+                        help="Simulation ticks per second, sets the game speed (default: 60)")
+    parser.add_argument("-r", "--render-rate", type=positive_int, default=60,
+                        help="Maximum rendered frames per second (default: 60)")
+    parser.add_argument("--input-latency", action="store_true",
+                        help="Reports key press to screen latency percentiles")
+    parser.add_argument("--perf-log", metavar="PATH",
+                        help="Writes how long each phase of every frame took into a CSV file")
+    parser.add_argument("--profile", metavar="DIR", nargs="?", const="profiles",
+                        help="Enables profiling captures started and stopped with the c key, "
+                             "saved into DIR (default: profiles)")
+    parser.add_argument("--track-allocations", metavar="PATH", nargs="?", const="allocations.jsonl",
+                        help="Tracks memory allocations and garbage collection pauses per scene, "
+                             "the report is printed and appended to PATH on exit (default: allocations.jsonl)")
+    parser.add_argument("--ai-telemetry", metavar="PATH",
+                        help="Appends what the AI did in every attempt at a level to PATH as JSON lines")
+    parser.add_argument("--record", metavar="DIR", nargs="?", const="recordings",
+                        help="Records every played level into DIR (default: recordings)")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="Replays the recording at normal speed")
     args = parser.parse_args()
 
-    app = SnakeApplication(args.window_size, args.fullscreen, args.autoplay, args.debug)
+    app = SnakeApplication(args.window_size, args.fullscreen, args.autoplay, args.debug,
+                           args.tick_rate, args.render_rate, args.input_latency, args.perf_log,
+                           args.profile, args.track_allocations, args.ai_telemetry,
+                           args.record, args.replay)
     app.run()
@@ -0,0 +1,39 @@
+import argparse
+import time
+
+import utils
+import game_engine
+
+
+def print_state(replayer: game_engine.Replayer) -> None:
+    engine = replayer.engine
+    blocks = engine.level.snake.blocks
+    eaten = sum(1 for entity in engine.level.static if isinstance(entity, game_engine.entities.Food) and entity.eaten)
+
+    print(f"Tick {replayer.tick}/{len(replayer)}: snake head {blocks[0] if blocks else None}, length {len(blocks)}, "
+          f"food eaten {eaten}, falling {engine.snake_is_falling}, level finished {engine.level_finished}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", metavar="PATH",
+                        help="The recording to replay")
+    parser.add_argument("--tick", type=int, nargs="+", metavar="N",
+                        help="Shows the state after N ticks instead of replaying to the end")
+    args = parser.parse_args()
+
+    recording = game_engine.Recording.load(args.path)
+    level, _, _ = utils.load_level(recording.level_number)
+    replayer = game_engine.Replayer(level, recording)
+    print(f"Level {recording.level_number}, {len(replayer)} ticks")
+
+    if args.tick:
+        for tick in args.tick:
+            replayer.seek(tick)
+            print_state(replayer)
+    else:
+        start = time.perf_counter()
+        replayer.run_to_end()
+        elapsed = time.perf_counter() - start
+        print(f"Replayed in {elapsed*1000:.1f} ms ({len(replayer) / max(elapsed, 1e-9):.0f} ticks/s)")
+        print_state(replayer)
@@ -1,5 +1,6 @@
 from .scene_abstract import KeyboardInput, Scene
 from .main_menu import MainMenu
+from .level_preloader import PreloadedLevel, LevelPreloader
 from .game import Game
 from .transition import Transition
 from .level_select import LevelSelect
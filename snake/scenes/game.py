@@ -1,23 +1,42 @@
+import concurrent.futures
 import copy
 import collections
+import os
 import time
 
-import utils
 import game_engine
 import ai
 import scenes
 
 FREEZE_FRAMES = 8
 
+# How many frames of the AI solution playback run per frame, None plays the rest of the solution at once
+PLAYBACK_SPEEDS: tuple[int | None, ...] = (1, 4, 16, None)
+# Jumping with up and down skips this many moves of the playback
+PLAYBACK_JUMP = 10
+# After the instant playback the level finishes in at most this many ticks (the snake falls or does its animation)
+MAX_FINISH_TICKS = 1000
+
+# Shortens the AI solutions in the background, the playback starts with the solution the AI found right away
+SOLUTION_OPTIMIZER = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="solution-optimizer")
+
 
 # Exit message values:
 #  0 - Open menu
 #  1-16 - Finished level 1-16
 #  17 - Exit level
 class Game(scenes.Scene):
-    def __init__(self, canvas, level_number: int, autoplay: bool, debug: bool):
+    # Pass preloaded if the level was already prepared in the background, otherwise it gets loaded now
+    # Pass ai_telemetry_log to append what the AI did in every attempt at the level to the file
+    # Pass record_dir to save everything that happened in the level there, or replay to play a recording again
+    def __init__(self, canvas, level_number: int, autoplay: bool, debug: bool,
+                 preloaded: scenes.PreloadedLevel | None = None, ai_telemetry_log: str | None = None,
+                 record_dir: str | None = None, replay: game_engine.Recording | None = None):
         super().__init__(canvas, False)
 
+        if preloaded is None:
+            preloaded = scenes.PreloadedLevel(level_number, autoplay)
+
         # Whether the AI or the player is controlling the snake
         self.autoplay = autoplay
 
@@ -25,10 +44,10 @@ class Game(scenes.Scene):
         self.level_number = level_number
 
         # Camera offset because you only ever see a part of the level
-        self.level, self.offsetx, self.offsety = utils.load_level(level_number)
+        self.level, self.offsetx, self.offsety = preloaded.level, preloaded.offsetx, preloaded.offsety
 
         # Copy of the level for restarting - just loads from here
-        self.level_copy = copy.deepcopy(self.level)
+        self.level_copy = preloaded.level_copy
         self.offsetx_copy, self.offsety_copy = self.offsetx, self.offsety
 
         # To calculate the camera offset
@@ -39,37 +58,116 @@ class Game(scenes.Scene):
         self.first_frame_time = time.monotonic()
         self.frame_count = 0
 
-        self.engine: game_engine.Engine = game_engine.Engine(self.level)
+        # Debug overlay layers that can be toggled on and off (only visible in debug mode)
+        self.show_debug_info = True
+        self.show_debug_groups = True
+        self.show_debug_reach = True
+
+        # The debug layers are expensive to calculate, so they are cached until something changes
+        #  group ids change only with interactions and the camera, reach only when the snake moves
+        self.debug_groups_key: tuple[int, int, int] | None = None
+        self.debug_groups: list[tuple[int, int, str]] = []
+        self.debug_reach_key: tuple | None = None
+        self.debug_reach: list[tuple[int, int]] = []
+
+        # What was visible last frame, the scene gets redrawn only when this changes
+        self.last_display_state: tuple | None = None
+
+        self.engine: game_engine.Engine = preloaded.engine
 
-        self.ai = ai.SnakeAI(self.level, self.engine.static_engine) if self.autoplay else None
+        self.ai = preloaded.ai
+        # How long the AI took to find its move in the last frame (for frame timing)
+        self.last_ai_time = 0.0
+        self.ai_telemetry_log = ai_telemetry_log
+        self.enable_ai_telemetry()
         self.ai_solution: collections.deque[game_engine.Action] = collections.deque()
         # When the AI finds the correct path it will play it back but input slowly so the user can see the solution
         self.playback = False
         self.level_finish_frame_countdown = FREEZE_FRAMES
 
+        # The playback can be sped up and it can jump to any move of the solution
+        #  the state before every played move is saved, jumping back just restores it
+        self.playback_speed_index = 0
+        self.playback_moves: list[game_engine.Action] = []
+        self.playback_snapshots: list[tuple[game_engine.EngineSnapshot, int, int]] = []
+        # The shorter solution with its states (ai.optimize_and_index), the playback switches to it
+        #  once it is ready and the snake gets to a state that is on it
+        self.optimized_solution: concurrent.futures.Future | None = None
+
+        # Every engine tick gets recorded (saved when leaving the level)
+        self.record_dir = record_dir
+        self.recording: game_engine.Recording | None = None
+        if record_dir:
+            self.recording = game_engine.Recording(level_number, game_engine.hash_level(self.level_copy))
+
+        # Replays the recording one tick per frame instead of taking the input from the player
+        self.replay = replay
+        self.replay_tick = 0
+        if replay and game_engine.hash_level(self.level_copy) != replay.level_hash:
+            raise ValueError(f"The recording is not of this level (level {level_number} changed?)")
+
+        # History of the level for going back to any past tick (only in debug mode)
+        #  timeline_tick is the tick being looked at, None when the game is running
+        self.timeline: game_engine.Timeline | None = game_engine.Timeline(self.engine) if debug else None
+        self.timeline_tick: int | None = None
+        self.timeline_offset = (self.offsetx, self.offsety)
+
     def process_frame(self, key_press: scenes.KeyboardInput | None):
+        self.last_ai_time = 0.0
+        self.process_game_frame(key_press)
+
+        # Big levels are preprocessed only around the camera (17 blocks fit on the screen)
+        self.engine.static_engine.prefetch(-self.offsetx, -self.offsety, 17, 17)
+
+        # Redraws only when something visible changed (the FPS counter in debug mode changes every frame)
+        display_state = self.get_display_state()
+        if display_state != self.last_display_state or (self.debug and self.show_debug_info):
+            self.last_display_state = display_state
+            self.dirty = True
+
+    def process_game_frame(self, key_press: scenes.KeyboardInput | None):
+        # The game is paused while going through the timeline
+        if self.timeline is not None and \
+                (self.timeline_tick is not None or key_press is scenes.KeyboardInput.TOGGLE_TIMELINE):
+            self.process_timeline_input(key_press)
+            return
+
         # Playing back the AI solution
         if self.playback:
+            self.process_playback_input(key_press)
+
             if self.ai_solution:
-                if self.level_finish_frame_countdown == 0:
-                    action = self.ai_solution.popleft()
-                    self.update_camera_offset(action)
-                    self.engine.process_frame(action)
-                    self.level_finish_frame_countdown = FREEZE_FRAMES
-                else:
-                    # Do nothing for this frame
-                    self.level_finish_frame_countdown -= 1
+                # Exit level
+                if key_press is scenes.KeyboardInput.ESC:
+                    self.is_running = False
+                    self.exit_message = 0
                     return
+
+                speed = PLAYBACK_SPEEDS[self.playback_speed_index]
+                if speed is None:
+                    self.jump_to_move(len(self.playback_moves))
+                    self.finish_playback()
+                else:
+                    for _ in range(speed):
+                        if not self.ai_solution:
+                            break
+                        self.process_playback_frame()
                 return
 
-        # Level finished successfully (by the player)
-        if self.engine.level_finished:
+        # Level finished successfully (by the player), a replay just stays at the end
+        if self.engine.level_finished and not self.replay:
             self.is_running = False
             self.exit_message = self.level_number
 
         # Level finished successfully (by the AI)
         if self.ai and self.ai.level_finished and not self.playback:
-            self.ai_solution = self.ai.final_path
+            self.write_ai_telemetry(True)
+            self.ai_solution = collections.deque(self.ai.final_path)
+            self.playback_moves = list(self.ai_solution)
+            # The brute force takes detours, a shorter solution gets prepared in the background
+            self.optimized_solution = SOLUTION_OPTIMIZER.submit(ai.optimize_and_index, self.level_copy,
+                                                                self.playback_moves)
+            self.playback_snapshots = []
             self.restart_level(False)
             self.playback = True
 
@@ -79,12 +177,37 @@ class Game(scenes.Scene):
             self.exit_message = 0
             return
 
+        # Toggle debug overlay layers
+        if key_press is scenes.KeyboardInput.TOGGLE_DEBUG_INFO:
+            self.show_debug_info = not self.show_debug_info
+        elif key_press is scenes.KeyboardInput.TOGGLE_DEBUG_GROUPS:
+            self.show_debug_groups = not self.show_debug_groups
+        elif key_press is scenes.KeyboardInput.TOGGLE_DEBUG_REACH:
+            self.show_debug_reach = not self.show_debug_reach
+
         move_snake = False
 
-        if self.autoplay:
+        if self.replay:
+            # Nothing more happens after the end of the recording
+            if self.replay_tick == len(self.replay.ticks):
+                return
+
+            code = self.replay.ticks[self.replay_tick]
+            self.replay_tick += 1
+            if code == game_engine.RESTART:
+                self.restart_level(False)
+                return
+
+            action = game_engine.Action(code)
+            move_snake = action in [game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
+                                    game_engine.Action.MOVE_UP, game_engine.Action.MOVE_DOWN]
+
+        elif self.autoplay:
             # Let """AI""" decide what to do
             if not self.ai.level_finished:
+                ai_start = time.perf_counter()
                 action = self.ai.get_next_move()
+                self.last_ai_time = time.perf_counter() - ai_start
 
                 if action in [game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
                               game_engine.Action.MOVE_UP, game_engine.Action.MOVE_DOWN]:
@@ -118,7 +241,7 @@ class Game(scenes.Scene):
 
         if move_snake:
             self.update_camera_offset(action)
-        self.engine.process_frame(action)
+        self.tick_engine(action)
 
         # Update camera offset when snake is falling or undoing movement or such
         if action not in [game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
@@ -141,13 +264,32 @@ class Game(scenes.Scene):
         if self.debug and not self.playback:
             self.display_debug(paddingx, paddingy, entity_paddingx, entity_paddingy, block_size)
 
+        if self.timeline_tick is not None:
+            font = scenes.Scene.get_font(screen_size, 20)
+            self.canvas.create_text(paddingx + screen_size*0.3,
+                                    paddingy + screen_size*0.95,
+                                    text=f"Timeline {self.timeline_tick}/{len(self.timeline)}",
+                                    font=font, fill="red")
+
+        if self.replay:
+            font = scenes.Scene.get_font(screen_size, 20)
+            self.canvas.create_text(paddingx + screen_size*0.75,
+                                    paddingy + screen_size*0.05,
+                                    text=f"Replay {self.replay_tick}/{len(self.replay.ticks)}",
+                                    font=font, fill="black")
+
         # Shows the user that the AI is playing back the solution
         if self.autoplay:
-            font = f"Arial {int(screen_size / 20)}"
+            font = scenes.Scene.get_font(screen_size, 20)
             if self.playback:
-                self.canvas.create_text(paddingx + screen_size*0.7,
+                speed = PLAYBACK_SPEEDS[self.playback_speed_index]
+                self.canvas.create_text(paddingx + screen_size*0.65,
                                         paddingy + screen_size*0.05,
-                                        text=f"Playing back solution",
+                                        text=f"Playing back solution {f'{speed}x' if speed else 'instantly'}",
+                                        font=font, fill="black")
+                self.canvas.create_text(paddingx + screen_size*0.65,
+                                        paddingy + screen_size*0.1,
+                                        text=f"Move {self.get_playback_move()}/{len(self.playback_moves)}",
                                         font=font, fill="black")
             else:
                 self.canvas.create_text(paddingx + screen_size*0.8,
@@ -163,16 +305,157 @@ class Game(scenes.Scene):
         self.canvas.create_rectangle(paddingx + screen_size, paddingy
                                      , 2*paddingx + screen_size, 2*paddingy + screen_size - 1, fill="black", outline="black")
 
-    def display_level_number(self, paddingx, paddingy, screen_size) -> None:
-        font = f"Arial {int(screen_size/2)}"
+    def process_playback_input(self, key_press: scenes.KeyboardInput | None):
+        if key_press is scenes.KeyboardInput.PLAYBACK_SPEED:
+            self.playback_speed_index = (self.playback_speed_index + 1) % len(PLAYBACK_SPEEDS)
+        elif key_press is scenes.KeyboardInput.LEFT:
+            self.jump_to_move(self.get_playback_move() - 1)
+        elif key_press is scenes.KeyboardInput.RIGHT:
+            self.jump_to_move(self.get_playback_move() + 1)
+        elif key_press is scenes.KeyboardInput.DOWN:
+            self.jump_to_move(self.get_playback_move() - PLAYBACK_JUMP)
+        elif key_press is scenes.KeyboardInput.UP:
+            self.jump_to_move(self.get_playback_move() + PLAYBACK_JUMP)
+
+    # One frame of the playback at normal speed - every few frames a move
+    def process_playback_frame(self):
+        if self.level_finish_frame_countdown == 0:
+            self.play_next_move()
+            self.level_finish_frame_countdown = FREEZE_FRAMES
+        else:
+            # Do nothing for this frame
+            self.level_finish_frame_countdown -= 1
+
+    def play_next_move(self):
+        self.switch_to_optimized_solution()
+        self.playback_snapshots.append((self.engine.snapshot(), self.offsetx, self.offsety))
+
+        action = self.ai_solution.popleft()
+        self.update_camera_offset(action)
+        self.tick_engine(action)
+
+    # The moves played so far stay, the rest of the solution gets replaced with the rest of the shorter one
+    def switch_to_optimized_solution(self):
+        if self.optimized_solution is None or not self.optimized_solution.done():
+            return
+
+        moves, states = self.optimized_solution.result()
+        move = states.get(ai.get_state_key(self.engine))
+        if move is None:
+            # Not on the shorter solution yet (in the middle of a detour), tries again after the next move
+            return
+
+        if len(moves) - move < len(self.ai_solution):
+            self.playback_moves = self.playback_moves[:self.get_playback_move()] + moves[move:]
+            self.ai_solution = collections.deque(moves[move:])
+        self.optimized_solution = None
+
+    # How many moves of the solution were played
+    def get_playback_move(self) -> int:
+        return len(self.playback_moves) - len(self.ai_solution)
 
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(paddingx, paddingy, paddingx + screen_size, paddingy + screen_size
-                                     , fill="black", outline="black")
-        self.canvas.create_text(paddingx + screen_size/2, paddingy + screen_size/2,
-                                text=str(self.level_number), font=font, fill="white")
-        self.canvas.update()
-        self.canvas.after(800)
+    # Gets to the state after the given number of moves of the solution
+    #  forward by playing the moves without waiting, back by restoring the state saved before the move
+    def jump_to_move(self, move: int):
+        move = max(0, min(move, len(self.playback_moves)))
+
+        if move < self.get_playback_move():
+            snapshot, self.offsetx, self.offsety = self.playback_snapshots[move]
+            self.engine.restore(snapshot)
+            del self.playback_snapshots[move:]
+            self.ai_solution = collections.deque(self.playback_moves[move:])
+
+            # The recording can not go back, it restarts the level and plays the moves again instead
+            self.record_ticks([game_engine.RESTART] + [action.value for action in self.playback_moves[:move]])
+
+        # The solution can get shorter while playing it
+        while self.ai_solution and self.get_playback_move() < move:
+            self.play_next_move()
+        self.level_finish_frame_countdown = FREEZE_FRAMES
+
+    # Lets the snake fall on the finish and do its animation right away
+    def finish_playback(self):
+        for _ in range(MAX_FINISH_TICKS):
+            if self.engine.level_finished:
+                break
+            self.tick_engine(game_engine.Action.DO_NOTHING)
+            if self.engine.movement_happened:
+                self.update_camera_offset(self.engine.last_movement)
+
+    # Going through the timeline - left and right move by a tick, down and up by a second
+    def process_timeline_input(self, key_press: scenes.KeyboardInput | None):
+        if key_press is scenes.KeyboardInput.TOGGLE_TIMELINE:
+            if self.timeline_tick is None:
+                self.timeline_tick = len(self.timeline)
+                self.timeline_offset = (self.offsetx, self.offsety)
+            else:
+                self.leave_timeline()
+            return
+
+        step = {scenes.KeyboardInput.LEFT: -1, scenes.KeyboardInput.RIGHT: 1,
+                scenes.KeyboardInput.DOWN: -game_engine.CHECKPOINT_INTERVAL,
+                scenes.KeyboardInput.UP: game_engine.CHECKPOINT_INTERVAL}.get(key_press)
+        if step:
+            self.timeline_tick = max(0, min(self.timeline_tick + step, len(self.timeline)))
+            self.timeline.seek(self.engine, self.timeline_tick)
+            self.center_camera()
+
+    def leave_timeline(self):
+        if self.autoplay or self.replay:
+            # The AI and the replay can only continue from where they were
+            self.timeline.seek(self.engine, len(self.timeline))
+            self.offsetx, self.offsety = self.timeline_offset
+        elif self.timeline_tick < len(self.timeline):
+            # The player continues from the past, what happened after it is forgotten
+            self.timeline.truncate(self.timeline_tick)
+            if self.recording:
+                self.recording.record([game_engine.RESTART] + list(self.timeline.ticks))
+
+        self.timeline_tick = None
+
+    # Processes one tick of the engine and records it
+    def tick_engine(self, action: game_engine.Action):
+        self.engine.process_frame(action)
+        self.record_ticks([action.value])
+
+    # Saves ticks into the recording and the timeline, the engine has to be in the state after them already
+    def record_ticks(self, ticks: list[int]):
+        if self.recording:
+            self.recording.record(ticks)
+        if self.timeline is not None:
+            self.timeline.record(ticks, self.engine)
+
+    # Everything that affects what gets displayed
+    def get_display_state(self) -> tuple:
+        # The AI path is only displayed in debug mode
+        ai_state = None
+        if self.debug and self.ai:
+            ai_state = (tuple(self.ai.path or ()),
+                        self.ai.find_path_force.destination if self.ai.find_path_force else None)
+
+        return (tuple(self.level.snake.blocks), self.level.snake.charge, self.offsetx, self.offsety,
+                self.engine.static_engine.version, self.playback, ai_state,
+                self.show_debug_groups, self.show_debug_reach, self.replay_tick,
+                self.playback_speed_index, self.get_playback_move(), self.timeline_tick)
+
+    # Saves what the AI did in this attempt at the level (only once per attempt)
+    # The AI counts what it does only when it gets saved or shown (in debug mode)
+    def enable_ai_telemetry(self):
+        if self.ai and (self.debug or self.ai_telemetry_log):
+            self.ai.enable_telemetry()
+
+    def write_ai_telemetry(self, finished: bool):
+        if self.ai and self.ai.telemetry and self.ai_telemetry_log:
+            self.ai.telemetry.write(self.ai_telemetry_log, self.level_number, finished)
+
+    # Saves the recording of the level into the record directory (only once, the recording stops then)
+    def save_recording(self):
+        if self.recording and self.recording.ticks:
+            os.makedirs(self.record_dir, exist_ok=True)
+            path = f"{self.record_dir}/level{self.level_number}-{time.strftime('%Y%m%d-%H%M%S')}.hadr"
+            self.recording.save(path)
+            print(f"Recording saved to {path}")
+        self.recording = None
 
     def restart_level(self, delete_ai_progress):
         self.level = copy.deepcopy(self.level_copy)
@@ -180,9 +463,25 @@ class Game(scenes.Scene):
         self.offsety = self.offsety_copy
 
         self.engine = game_engine.Engine(self.level)
+        self.record_ticks([game_engine.RESTART])
+
+        # The new engine starts its interaction versions from zero again
+        self.debug_groups_key = None
+        self.debug_reach_key = None
 
         if delete_ai_progress:
+            # Restarting a replay from the menu starts the recording from the beginning
+            self.replay_tick = 0
+            self.write_ai_telemetry(False)
             self.ai = ai.SnakeAI(self.level, self.engine.static_engine) if self.autoplay else None
+            self.enable_ai_telemetry()
+
+    # Moves the camera so that the snake head is in the middle of the screen (as much as the level allows)
+    def center_camera(self):
+        if self.level.snake.blocks:
+            x, y = self.level.snake.blocks[0]
+            self.offsetx = max(16 - self.level_width, min(-1, 8 - x))
+            self.offsety = max(16 - self.level_height, min(-1, 8 - y))
 
     # This does not take into account if the snake actually moved - intentional
     def update_camera_offset(self, action):
@@ -223,36 +522,73 @@ class Game(scenes.Scene):
                                                  entity_paddingy + block_size * (y + 0.9),
                                                  fill="blue", outline="")
 
-        first_block = self.level.snake.blocks[0] if self.level.snake.blocks else (-1, -1)
-        self.canvas.create_text(paddingx + 120, paddingy + 20,
-                                text=f"Snake head x: {first_block[0]}, y: {first_block[1]}",
-                                font="Arial 20", fill="red")
-        self.canvas.create_text(paddingx + 130, paddingy + 40,
-                                text=f"Camera offset x: {self.offsetx}, y: {self.offsety}",
-                                font="Arial 20", fill="red")
-        self.canvas.create_text(paddingx + 130, paddingy + 60,
-                                text=f"Movement stopped: {self.engine.movement_stopped}",
-                                font="Arial 20", fill="red")
         self.frame_count += 1
-        self.canvas.create_text(paddingx + 50, paddingy + 80,
-                                text=f"FPS: {int(self.frame_count/(time.monotonic() - self.first_frame_time))}",
-                                font="Arial 20", fill="red")
-
-        if self.level.snake.blocks:
-            reach = ai.get_reach(self.level.snake.blocks[0], self.engine.static_engine
-                              , len(self.level.snake.blocks), self.level.width, self.level.height)
-            for x, y in reach:
+        if self.show_debug_info:
+            first_block = self.level.snake.blocks[0] if self.level.snake.blocks else (-1, -1)
+            self.canvas.create_text(paddingx + 120, paddingy + 20,
+                                    text=f"Snake head x: {first_block[0]}, y: {first_block[1]}",
+                                    font="Arial 20", fill="red")
+            self.canvas.create_text(paddingx + 130, paddingy + 40,
+                                    text=f"Camera offset x: {self.offsetx}, y: {self.offsety}",
+                                    font="Arial 20", fill="red")
+            self.canvas.create_text(paddingx + 130, paddingy + 60,
+                                    text=f"Movement stopped: {self.engine.movement_stopped}",
+                                    font="Arial 20", fill="red")
+            self.canvas.create_text(paddingx + 50, paddingy + 80,
+                                    text=f"FPS: {int(self.frame_count/(time.monotonic() - self.first_frame_time))}",
+                                    font="Arial 20", fill="red")
+
+            if self.ai and self.ai.telemetry:
+                # What the AI is doing right now and what it did in total
+                subgoal = self.ai.telemetry.current
+                totals = self.ai.telemetry.get_totals()
+                for i, (name, counters) in enumerate([(f"AI {subgoal.kind}", vars(subgoal)), ("AI total", totals)]):
+                    self.canvas.create_text(paddingx + 10, paddingy + 100 + 20*i, anchor="w",
+                                            text=f"{name}: {counters['expansions']} expanded, "
+                                                 f"{counters['pushes']} pushes, {counters['undos']} undos, "
+                                                 f"{counters['get_interactions_calls']} lookups, "
+                                                 f"{counters['time'] * 1000:.0f} ms",
+                                            font="Arial 14", fill="red")
+
+        if self.show_debug_reach and self.level.snake.blocks:
+            for x, y in self.get_debug_reach():
                 self.canvas.create_rectangle(entity_paddingx + block_size * (x + 0.3),
                                              entity_paddingy + block_size * (y + 0.3),
                                              entity_paddingx + block_size * (x + 0.7),
                                              entity_paddingy + block_size * (y + 0.7),
                                              fill="red", outline="")
 
-        font = f"Arial {int(block_size * 17 / 45)}"
-        for x in range(self.level.width):
-            for y in range(self.level.height):
-                # This should not be here but whatever it's just for debug
-                groups = self.engine.static_engine._position_hash[(x, y)]
+        if self.show_debug_groups:
+            font = scenes.Scene.get_font(block_size * 17, 45)
+            for x, y, text in self.get_debug_groups():
                 self.canvas.create_text(entity_paddingx + (x + 0.5) * block_size
                                         , entity_paddingy + (y + 0.5) * block_size
-                                        , text=groups, font=font, fill="blue")
+                                        , text=text, font=font, fill="blue")
+
+    # Reachable positions from the snake head, recalculated only when the snake moves
+    def get_debug_reach(self) -> list[tuple[int, int]]:
+        static_engine = self.engine.static_engine
+        key = (tuple(self.level.snake.blocks), static_engine.version)
+
+        if key != self.debug_reach_key:
+            self.debug_reach_key = key
+            self.debug_reach = ai.get_reach(self.level.snake.blocks[0], static_engine
+                                            , len(self.level.snake.blocks), self.level.width, self.level.height)
+        return self.debug_reach
+
+    # Group ids of positions visible on the screen, recalculated only when interactions or the camera change
+    def get_debug_groups(self) -> list[tuple[int, int, str]]:
+        static_engine = self.engine.static_engine
+        key = (static_engine.version, self.offsetx, self.offsety)
+
+        if key != self.debug_groups_key:
+            self.debug_groups_key = key
+            self.debug_groups = []
+
+            # 17 blocks fit on the screen, the camera offset is the position of the top left corner
+            for x in range(-self.offsetx, -self.offsetx + 17):
+                for y in range(-self.offsety, -self.offsety + 17):
+                    groups = static_engine.get_group_ids(x, y)
+                    if groups:
+                        self.debug_groups.append((x, y, " ".join(str(group) for group in groups)))
+        return self.debug_groups
@@ -44,7 +44,7 @@ class LevelMenu(scenes.Scene):
         # GUI made for 508x508 screen originally
         n = lambda x, y: scenes.Scene.normalize_to_frame(x, y, paddingx, paddingy, screen_size / 508)
 
-        font = f"Arial {int(screen_size / 25)}"
+        font = scenes.Scene.get_font(screen_size, 25)
         fill = "white"
         outline = "black"
 
@@ -0,0 +1,55 @@
+import concurrent.futures
+import copy
+
+import utils
+import game_engine
+import ai
+
+# How many preloaded levels are kept at once, the oldest ones get dropped
+MAX_PRELOADED_LEVELS = 3
+
+
+# Everything a Game needs that takes a while to create (parsed level, its copy for restarting, engines, AI)
+class PreloadedLevel:
+    def __init__(self, level_number: int, autoplay: bool):
+        self.level_number = level_number
+        self.autoplay = autoplay
+
+        self.level, self.offsetx, self.offsety = utils.load_level(level_number)
+        self.level_copy = copy.deepcopy(self.level)
+
+        self.engine: game_engine.Engine = game_engine.Engine(self.level)
+        self.ai = ai.SnakeAI(self.level, self.engine.static_engine) if autoplay else None
+
+
+# Prepares levels in a worker thread (for example during the transition animation)
+#  so that starting a level only attaches the ready objects to a new Game
+class LevelPreloader:
+    def __init__(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preloader")
+        self.preloading: dict[tuple[int, bool], concurrent.futures.Future] = {}
+
+    # Starts preparing the level in the background if it is not being prepared already
+    def preload(self, level_number: int, autoplay: bool) -> None:
+        key = (level_number, autoplay)
+        if key in self.preloading:
+            return
+
+        while len(self.preloading) >= MAX_PRELOADED_LEVELS:
+            oldest = next(iter(self.preloading))
+            self.preloading.pop(oldest).cancel()
+
+        self.preloading[key] = self.executor.submit(PreloadedLevel, level_number, autoplay)
+
+    # Returns the prepared level, waits for it if it is not ready yet or prepares it right now if it was not requested
+    #  every preloaded level can be taken only once, the Game changes it while playing
+    def take(self, level_number: int, autoplay: bool) -> PreloadedLevel:
+        future = self.preloading.pop((level_number, autoplay), None)
+        if future is None or future.cancelled():
+            return PreloadedLevel(level_number, autoplay)
+
+        # Raises the exception from loading the level if there was one
+        return future.result()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -6,12 +6,15 @@ import scenes
 #  0 - Exit to main menu
 #  1-16 - Start level 1-16
 class LevelSelect(scenes.Scene):
-    def __init__(self, canvas, player_data: utils.PlayerData):
+    def __init__(self, canvas, player_data: utils.PlayerData, level_index: utils.LevelIndex):
         super().__init__(canvas, False)
 
         self.levels = player_data.levels
         self.levels[0] = True
 
+        # Levels that do not exist stay locked
+        self.level_index = level_index
+
         # Menu is 4x4 grid
         self.menu_selection_x = 0
         self.menu_selection_y = 0
@@ -33,8 +36,7 @@ class LevelSelect(scenes.Scene):
             self.menu_selection_x = min(3, self.menu_selection_x + 1)
 
         # Start the level if it is unlocked
-        elif key_press is scenes.KeyboardInput.ENTER and \
-                (self.levels[self.level_number()] or (self.menu_selection_x == 0 and self.menu_selection_y == 0)):
+        elif key_press is scenes.KeyboardInput.ENTER and self.is_selected_unlocked():
             self.is_running = False
             self.exit_message = self.level_number()
 
@@ -44,11 +46,11 @@ class LevelSelect(scenes.Scene):
         # GUI made for 508x508 screen originally
         n = lambda x, y: scenes.Scene.normalize_to_frame(x, y, paddingx, paddingy, screen_size / 508)
 
-        font = f"Arial {int(screen_size/10)}"
+        font = scenes.Scene.get_font(screen_size, 10)
 
         for dx in range(4):
             for dy in range(4):
-                if self.levels[coords_to_number(dx, dy)] or (dx == 0 and dy == 0):
+                if self.is_unlocked(coords_to_number(dx, dy)):
                     c.create_rectangle(n(22 + 122 * dx,                                      # :DDD
                                          22 + 122 * dy),
                                        n(122 + 122 * dx,
@@ -64,12 +66,19 @@ class LevelSelect(scenes.Scene):
                                          122 + 122 * dy),
                                        width=5, fill="black", outline="black")
 
-        if self.levels[self.level_number()] or (self.menu_selection_x == 0 and self.menu_selection_y == 0):
+        if self.is_selected_unlocked():
             c.create_rectangle(n(20 + 122 * self.menu_selection_x,
                                  20 + 122 * self.menu_selection_y),
                                n(124 + 122 * self.menu_selection_x,
                                  124 + 122 * self.menu_selection_y),
                                width=11, outline="black")
+
+            # Info about the selected level
+            info = self.level_index.get(self.level_number())
+            c.create_text(n(72 + 122 * self.menu_selection_x,
+                            108 + 122 * self.menu_selection_y)
+                          , text=f"{info.width}x{info.height}, {info.food_count} food"
+                          , font=scenes.Scene.get_font(screen_size, 50), fill="black")
         else:
             c.create_text(n(72 + 122 * self.menu_selection_x,
                             72 + 122 * self.menu_selection_y)
@@ -79,6 +88,13 @@ class LevelSelect(scenes.Scene):
     def level_number(self):
         return coords_to_number(self.menu_selection_x, self.menu_selection_y)
 
+    def is_selected_unlocked(self) -> bool:
+        return self.is_unlocked(self.level_number())
+
+    # The first level is always unlocked
+    def is_unlocked(self, level_number: int) -> bool:
+        return self.level_index.has_level(level_number) and (bool(self.levels[level_number]) or level_number == 1)
+
 
 # Returns the selected level number from x, y coords
 def coords_to_number(x, y):
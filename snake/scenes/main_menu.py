@@ -54,9 +54,9 @@ class MainMenu(scenes.Scene):
         # GUI made for 508x508 screen originally
         n = lambda x, y: scenes.Scene.normalize_to_frame(x, y, paddingx, paddingy, screen_size/508)
 
-        font_enter = f"Arial {int(screen_size/30)}"
-        font_menu = f"Arial {int(screen_size/25)}"
-        font_arrows = f"Arial {int(screen_size/20)}"
+        font_enter = scenes.Scene.get_font(screen_size, 30)
+        font_menu = scenes.Scene.get_font(screen_size, 25)
+        font_arrows = scenes.Scene.get_font(screen_size, 20)
         color = "black"
 
         c.create_rectangle(n(30, 30), n(240, 160), width=5, outline=color)
@@ -1,6 +1,7 @@
 import tkinter
 import abc
 import enum
+import functools
 
 
 # Set to None when the key is not supported
@@ -14,6 +15,12 @@ class KeyboardInput(enum.Enum):
     # Debug featues, the user should not use these for actually playing the game
     UNDO = enum.auto()
     STOP_MOVEMENT = enum.auto()
+    TOGGLE_DEBUG_INFO = enum.auto()
+    TOGGLE_DEBUG_GROUPS = enum.auto()
+    TOGGLE_DEBUG_REACH = enum.auto()
+    TOGGLE_TIMELINE = enum.auto()
+    # Changes the speed of the AI solution playback
+    PLAYBACK_SPEED = enum.auto()
 
 
 class Scene(abc.ABC):
@@ -31,6 +38,13 @@ class Scene(abc.ABC):
         # Whether the scene is transparent (should display scenes behind it)
         self.transparent = transparent
 
+        # Whether the scene changed since it was last displayed, nothing gets redrawn when no visible scene is dirty
+        self.dirty: bool = True
+
+        # Whether the scene can update its items already on the canvas with update_frame
+        #  instead of the whole canvas being cleared and redrawn when it is the only thing that changed
+        self.incremental: bool = False
+
     @abc.abstractmethod
     def process_frame(self, key_press: KeyboardInput | None) -> None:
         pass
@@ -39,6 +53,17 @@ class Scene(abc.ABC):
     def display_frame(self, paddingx: int, paddingy: int, screen_size: int) -> None:
         pass
 
+    # Only called when self.incremental is True and display_frame was called before with the same screen
+    #  scenes that are not incremental are always redrawn with display_frame, for them this does nothing
+    def update_frame(self, paddingx: int, paddingy: int, screen_size: int) -> None:
+        pass
+
     @staticmethod
     def normalize_to_frame(x, y, paddingx, paddingy, screen_size):
         return paddingx + x*screen_size, paddingy + y*screen_size
+
+    # Font scaled to the screen size, cached so it is only calculated again after a resize
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def get_font(screen_size, divisor) -> str:
+        return f"Arial {int(screen_size / divisor)}"
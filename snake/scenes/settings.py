@@ -44,7 +44,7 @@ class Settings(scenes.Scene):
         # GUI made for 508x508 screen originally
         n = lambda x, y: scenes.Scene.normalize_to_frame(x, y, paddingx, paddingy, screen_size / 508)
 
-        font = f"Arial {int(screen_size/15)}"
+        font = scenes.Scene.get_font(screen_size, 15)
 
         c.create_rectangle(n(20, 194),
                            n(488, 294),
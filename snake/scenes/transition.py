@@ -4,6 +4,9 @@ import random
 
 import scenes
 
+# How long the level number stays on the covered screen before the level is revealed (in seconds)
+LEVEL_INTRO_TIME = 0.8
+
 
 # Exit message values:
 #  0 - End application
@@ -17,13 +20,21 @@ class Transition(scenes.Scene):
         END_APPLICATION = enum.auto()
 
     # Only pass level_number if type is START_LEVEL
-    def __init__(self, canvas, type: "Transition.Type", level_number: int | None = None):
+    #  intro_start is when the screen got covered, the level intro time counts from there (defaults to now)
+    def __init__(self, canvas, type: "Transition.Type", level_number: int | None = None,
+                 intro_start: float | None = None):
         super().__init__(canvas, True)
 
         # Ends the transition after 3 seconds if it ends the application
         #  or after the animation is finished if it starts a level
         self.start_time = time.monotonic()
 
+        # Before revealing a level the covered screen shows the level number for a while
+        #  without blocking, the level gets loaded during this time
+        self.intro_end = None
+        if type is Transition.Type.START_LEVEL_SECOND_HALF:
+            self.intro_end = (intro_start if intro_start is not None else self.start_time) + LEVEL_INTRO_TIME
+
         self.type = type
 
         if type is Transition.Type.END_APPLICATION:
@@ -32,11 +43,20 @@ class Transition(scenes.Scene):
             self.text = str(level_number)
 
         # Does a cool spiral animation
-        self.spiral_coords: list[tuple[int, int]] = generate_spiral_coords()
+        self.spiral_coords: list[tuple[int, int]] = SPIRAL_COORDS
         # -1 because it gets incremented before the first display
         self.spiral_index = -1
         self.animation_finished = False
 
+        # The spiral blocks stay on the canvas between frames, only the newly covered
+        #  (or uncovered in the second half) blocks change - the scenes below stay frozen as they are
+        self.incremental = True
+        self.spiral_items: dict[int, int] = {}
+        self.text_item: int | None = None
+        self.block_size = 0
+        self.paddingx = 0
+        self.paddingy = 0
+
     def process_frame(self, key_press: scenes.KeyboardInput | None):
         if (self.animation_finished
                 and (self.type == Transition.Type.END_APPLICATION and time.monotonic() - self.start_time > 3
@@ -44,40 +64,73 @@ class Transition(scenes.Scene):
             self.is_running = False
             self.exit_message = (0 if self.type is Transition.Type.END_APPLICATION else 1)
 
+        # Still showing the level intro
+        if self.intro_end is not None:
+            if time.monotonic() < self.intro_end:
+                return
+            self.intro_end = None
+
         # Progresses the animation
-        self.spiral_index += 1
+        if not self.animation_finished:
+            self.spiral_index += 1
+            self.dirty = True
         if self.spiral_index == len(self.spiral_coords):
             self.animation_finished = True
 
     def display_frame(self, paddingx, paddingy, screen_size) -> None:
-        block_size = screen_size/7
-
-        if (self.type is Transition.Type.GENERIC_SECOND_HALF
-                or self.type is Transition.Type.START_LEVEL_SECOND_HALF):
-            coords = self.spiral_coords[self.spiral_index:]
-        else:
-            coords = self.spiral_coords[:self.spiral_index]
+        self.block_size = screen_size/7
+        self.paddingx = paddingx
+        self.paddingy = paddingy
 
-        for x, y in coords:
-            self.canvas.create_rectangle(paddingx + block_size*x,
-                                         paddingy + block_size*y,
-                                         paddingx + block_size*(x + 1),
-                                         paddingy + block_size*(y + 1),
-                                         fill="black", outline="black")
+        # The canvas was cleared, all items get created again
+        self.spiral_items = {}
+        for i in self.get_covered_indexes():
+            self.create_spiral_block(i)
 
+        self.text_item = None
         if self.type is Transition.Type.END_APPLICATION:
             # GUI made for 508x508 screen originally
             scale = screen_size / 508
-            self.canvas.create_text(paddingx + scale*400,
-                                    paddingy + scale*450,
-                                    text=self.text,
-                                    font=f"Arial {int(screen_size / 30)}", fill="white")
+            self.text_item = self.canvas.create_text(paddingx + scale*400,
+                                                     paddingy + scale*450,
+                                                     text=self.text,
+                                                     font=scenes.Scene.get_font(screen_size, 30), fill="white")
         elif (self.type is Transition.Type.START_LEVEL_FIRST_HALF
                 or self.type is Transition.Type.START_LEVEL_SECOND_HALF):
-            self.canvas.create_text(paddingx + screen_size / 2,
-                                    paddingy + screen_size / 2,
-                                    text=self.text,
-                                    font=f"Arial {int(screen_size / 2)}", fill="white")
+            self.text_item = self.canvas.create_text(paddingx + screen_size / 2,
+                                                     paddingy + screen_size / 2,
+                                                     text=self.text,
+                                                     font=scenes.Scene.get_font(screen_size, 2), fill="white")
+
+    # Only adds or removes the spiral blocks that changed since the last frame
+    def update_frame(self, paddingx, paddingy, screen_size) -> None:
+        covered = set(self.get_covered_indexes())
+
+        for i in [i for i in self.spiral_items if i not in covered]:
+            self.canvas.delete(self.spiral_items.pop(i))
+        for i in covered:
+            if i not in self.spiral_items:
+                self.create_spiral_block(i)
+
+        # New blocks would be drawn over the text
+        if self.text_item is not None:
+            self.canvas.tag_raise(self.text_item)
+
+    # Indexes of the spiral blocks that are covering the screen this frame
+    def get_covered_indexes(self) -> range:
+        if (self.type is Transition.Type.GENERIC_SECOND_HALF
+                or self.type is Transition.Type.START_LEVEL_SECOND_HALF):
+            return range(max(0, self.spiral_index), len(self.spiral_coords))
+        else:
+            return range(0, max(0, self.spiral_index))
+
+    def create_spiral_block(self, i: int) -> None:
+        x, y = self.spiral_coords[i]
+        self.spiral_items[i] = self.canvas.create_rectangle(self.paddingx + self.block_size*x,
+                                                            self.paddingy + self.block_size*y,
+                                                            self.paddingx + self.block_size*(x + 1),
+                                                            self.paddingy + self.block_size*(y + 1),
+                                                            fill="black", outline="black")
 
 
 def generate_spiral_coords() -> list[tuple[int, int]]:
@@ -99,3 +152,7 @@ def generate_spiral_coords() -> list[tuple[int, int]]:
         x, y = x + dx, y + dy
 
     return spiral_coords
+
+
+# The spiral is the same for every transition
+SPIRAL_COORDS: list[tuple[int, int]] = generate_spiral_coords()
@@ -0,0 +1,54 @@
+import copy
+import random
+import unittest
+
+import utils
+import game_engine
+
+# One hour of ticks at 60 ticks per second
+SESSION_TICKS = 216_000
+
+
+class TimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.level, _, _ = utils.generate_level(utils.LevelParameters(32, 24), 0)
+
+    def test_checkpoint_gaps_grow_with_age(self):
+        engine = game_engine.Engine(copy.deepcopy(self.level))
+        timeline = game_engine.Timeline(engine)
+        for _ in range(SESSION_TICKS):
+            timeline.record([game_engine.Action.DO_NOTHING.value], engine)
+
+        ticks = timeline.checkpoint_ticks
+        self.assertEqual(ticks[0], 0)
+        for older, newer in zip(ticks, ticks[1:]):
+            self.assertLessEqual(newer - older, game_engine.timeline.get_max_gap(SESSION_TICKS - newer))
+        self.assertLess(len(ticks), 200)
+
+    def test_seek_matches_simulation(self):
+        rng = random.Random(0)
+        choices = [game_engine.Action.DO_NOTHING, game_engine.Action.MOVE_LEFT, game_engine.Action.MOVE_RIGHT,
+                   game_engine.Action.MOVE_UP, game_engine.Action.MOVE_DOWN, game_engine.Action.UNDO_MOVEMENT]
+        actions = [rng.choice(choices) for _ in range(3000)]
+
+        engine = game_engine.Engine(copy.deepcopy(self.level))
+        timeline = game_engine.Timeline(engine)
+        states = [get_state(engine)]
+        for action in actions:
+            engine.process_frame(action)
+            timeline.record([action.value], engine)
+            states.append(get_state(engine))
+
+        for tick in [len(actions), 0, 2999, 1234, 60, 61, 59, 2500]:
+            timeline.seek(engine, tick)
+            self.assertEqual(get_state(engine), states[tick])
+
+
+def get_state(engine: game_engine.Engine) -> tuple:
+    return (tuple(engine.level.snake.blocks), engine.snake_is_falling, engine.falling_frame_countdown,
+            len(engine.undo_stack), frozenset((entity.x, entity.y) for entity in engine.level.static
+                                              if isinstance(entity, game_engine.entities.Food) and entity.eaten))
+
+
+if __name__ == "__main__":
+    unittest.main()
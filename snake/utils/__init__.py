@@ -1,4 +1,14 @@
 from .resources_path import get_resources_path
-from .load_level import load_level
+from .compiled_level import load_compiled_level, save_compiled_level
+from .load_level import load_level, parse_level
+from .rect_index import RectIndex
 from .group import get_connected_conductive_groups, get_connected_blocks
-from .player_data import PlayerData
\ No newline at end of file
+from .write_behind import WriteBehindFile
+from .player_data import PlayerData
+from .level_index import LevelIndex, LevelInfo
+from .stats import percentiles
+from .frame_timer import FrameTimer, PHASES
+from .profiler import Profiler
+from .allocation_tracker import AllocationTracker
+from .level_generator import LevelParameters, generate_level, generate_solvable_level, generate_corpus, save_level, \
+    LAYOUTS, FINISH_PLACEMENTS, CORPORA
@@ -0,0 +1,155 @@
+import collections
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import utils
+
+# Every this many frames the allocations of the frame are traced back to the lines that made them
+#  (taking the snapshots is slow, so it is not done every frame)
+SNAPSHOT_FRAMES = 60
+# During the traced frames a snapshot is taken every time the memory allocated in the frame doubles (starting here)
+#  the last one has at least half of what was allocated at the peak, garbage freed before the frame ended included
+PEAK_SNAPSHOT_START = 1024
+# How many call sites are shown in the report
+REPORT_CALL_SITES = 5
+
+
+# Allocation statistics of one scene type
+class SceneAllocations:
+    def __init__(self):
+        self.frames = 0
+
+        # Most memory allocated at once during a frame (garbage included) and memory left over after it
+        #  traced frames are not in allocated, the snapshots taken during them make the peak bigger
+        self.allocated: list[int] = []
+        self.retained: list[int] = []
+
+        self.gc_pauses: list[float] = []
+
+        # Memory allocated at the peak of the traced frames (garbage included) by the line that allocated it
+        self.call_sites: collections.Counter[str] = collections.Counter()
+
+
+# Tracks memory allocations per frame and garbage collection pauses per scene type
+#  the report is printed and saved when the tracking stops, so allocation regressions can be compared over time
+class AllocationTracker:
+    def __init__(self, log_path: str | None = None):
+        self.log_path = log_path
+        self.scenes: dict[str, SceneAllocations] = {}
+
+        self.current: SceneAllocations | None = None
+        self.frame_number = 0
+        self.frame_start = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        # Snapshot taken closest to the peak of the traced frame and how much memory the next one needs
+        self.peak_snapshot: tracemalloc.Snapshot | None = None
+        self.next_peak_snapshot = 0
+        self.tracing_peak = False
+
+        self.gc_start = 0.0
+
+    def start(self) -> None:
+        tracemalloc.start()
+        gc.callbacks.append(self.on_gc)
+
+    def stop(self) -> None:
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+        tracemalloc.stop()
+        self.report()
+
+    def begin_frame(self, scene: str) -> None:
+        self.current = self.scenes.setdefault(scene, SceneAllocations())
+
+        self.snapshot = None
+        if self.frame_number % SNAPSHOT_FRAMES == 0:
+            self.snapshot = take_snapshot()
+
+        tracemalloc.reset_peak()
+        self.frame_start = tracemalloc.get_traced_memory()[0]
+
+        # Watches the memory on every function call and return to get a snapshot near the peak
+        #  (not while profiling, the profiler uses the same hook)
+        if self.snapshot is not None and sys.getprofile() is None:
+            self.next_peak_snapshot = self.frame_start + PEAK_SNAPSHOT_START
+            self.tracing_peak = True
+            sys.setprofile(self.on_profile_event)
+
+    def end_frame(self) -> None:
+        if self.tracing_peak:
+            sys.setprofile(None)
+            self.tracing_peak = False
+
+        if self.snapshot is not None:
+            # Without a snapshot near the peak only the memory left over after the frame gets attributed
+            snapshot = self.peak_snapshot or take_snapshot()
+            for stat in snapshot.compare_to(self.snapshot, "lineno"):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    self.current.call_sites[f"{os.path.basename(frame.filename)}:{frame.lineno}"] += stat.size_diff
+            self.peak_snapshot = None
+            del snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.current.frames += 1
+        if self.snapshot is None:
+            self.current.allocated.append(peak - self.frame_start)
+        self.current.retained.append(current - self.frame_start)
+
+        self.frame_number += 1
+
+    def on_profile_event(self, frame, event: str, arg) -> None:
+        current = tracemalloc.get_traced_memory()[0]
+        if current >= self.next_peak_snapshot:
+            # Only the last one is needed, the memory of the previous one is freed first
+            self.peak_snapshot = None
+            self.peak_snapshot = take_snapshot()
+            self.next_peak_snapshot = self.frame_start + 2*(current - self.frame_start)
+
+    def on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+        elif self.current is not None:
+            self.current.gc_pauses.append(time.perf_counter() - self.gc_start)
+
+    def report(self) -> None:
+        records = []
+        for scene, allocations in sorted(self.scenes.items()):
+            allocated = utils.percentiles(allocations.allocated)
+            pauses = utils.percentiles(allocations.gc_pauses)
+            record = {
+                "time": time.time(),
+                "scene": scene,
+                "frames": allocations.frames,
+                "allocated_p50": allocated[0], "allocated_p95": allocated[1], "allocated_p99": allocated[2],
+                "allocated_max": max(allocations.allocated, default=0),
+                "retained_total": sum(allocations.retained),
+                "gc_pauses": len(allocations.gc_pauses),
+                "gc_pause_p50": pauses[0], "gc_pause_p99": pauses[2],
+                "gc_pause_max": max(allocations.gc_pauses, default=0.0),
+                "call_sites": dict(allocations.call_sites.most_common(REPORT_CALL_SITES))
+            }
+            records.append(record)
+
+            print(f"{scene}: {record['frames']} frames, allocated per frame p50 {allocated[0] / 1024:.1f} KiB, "
+                  f"p99 {allocated[2] / 1024:.1f} KiB, max {record['allocated_max'] / 1024:.1f} KiB, "
+                  f"retained {record['retained_total'] / 1024:.1f} KiB")
+            print(f"  {record['gc_pauses']} GC pauses, p50 {pauses[0] * 1000:.2f} ms, p99 {pauses[2] * 1000:.2f} ms, "
+                  f"max {record['gc_pause_max'] * 1000:.2f} ms")
+            for call_site, size in record["call_sites"].items():
+                print(f"  {call_site}: {size / 1024:.1f} KiB")
+
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+
+# Snapshot without the memory tracemalloc and the tracker itself use
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                      tracemalloc.Filter(False, __file__)])
@@ -0,0 +1,165 @@
+import array
+import functools
+import hashlib
+import mmap
+import os
+import struct
+
+import game_engine
+
+# Compiled levels are saved next to the source level as "<level>.hadikc", they get recompiled
+#  when the source changes (checked by modification time and size, or the hash when those do not match)
+COMPILED_EXTENSION = "c"
+MAGIC = b"HADIKC"
+VERSION = 1
+
+# Magic, version, source modification time (ns), source size, source sha1
+HEADER = struct.Struct("<6sHQQ20s")
+# Width, height, camera offset x, camera offset y, whether there is a snake, snake x, snake y
+LEVEL = struct.Struct("<7i")
+COUNT = struct.Struct("<I")
+# Entity type, x, y, width, height
+ENTITY = struct.Struct("<B4i")
+# Grid x, y, width, height (followed by width*height bytes of interaction flags)
+GRID = struct.Struct("<4i")
+# Group type, number of entities, number of positions (followed by entity indexes and positions)
+GROUP = struct.Struct("<BII")
+
+
+# Saved type of every entity and interaction group
+#  created when first used, game_engine can be only partially imported when this module is imported
+@functools.lru_cache(maxsize=None)
+def get_entity_types() -> dict[type, int]:
+    return {game_engine.entities.Wall: 1, game_engine.entities.Food: 2, game_engine.entities.Finish: 3}
+
+
+@functools.lru_cache(maxsize=None)
+def get_group_types() -> dict["game_engine.InteractionType", int]:
+    return {game_engine.InteractionType.FOOD: 1, game_engine.InteractionType.CHARGE: 2}
+
+
+def get_compiled_path(level_path: str) -> str:
+    return level_path + COMPILED_EXTENSION
+
+
+# Returns the level and the starting camera offset from the compiled level
+#  or None if it does not exist, is outdated or broken
+def load_compiled_level(level_path: str) -> tuple[game_engine.Level, int, int] | None:
+    compiled_path = get_compiled_path(level_path)
+    if not os.path.exists(compiled_path):
+        return None
+
+    try:
+        with open(compiled_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, mtime, size, source_hash = HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION or not is_up_to_date(level_path, mtime, size, source_hash):
+                return None
+
+            return read_level(data, HEADER.size)
+    except (OSError, ValueError, struct.error, IndexError, KeyError):
+        return None
+
+
+# Saves the level with its preprocessed static interactions, does nothing if it can not be saved
+def save_compiled_level(level_path: str, level: game_engine.Level, offsetx: int, offsety: int) -> None:
+    stat = os.stat(level_path)
+    with open(level_path, "rb") as f:
+        source_hash = hashlib.sha1(f.read()).digest()
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size, source_hash))
+    write_level(data, level, offsetx, offsety)
+
+    # Writes to a temporary file first, so a half written file is never loaded
+    compiled_path = get_compiled_path(level_path)
+    try:
+        with open(compiled_path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(compiled_path + ".tmp", compiled_path)
+    except OSError:
+        pass
+
+
+def is_up_to_date(level_path: str, mtime: int, size: int, source_hash: bytes) -> bool:
+    stat = os.stat(level_path)
+    if stat.st_mtime_ns == mtime and stat.st_size == size:
+        return True
+
+    # The file was touched, but it might not have changed
+    with open(level_path, "rb") as f:
+        return hashlib.sha1(f.read()).digest() == source_hash
+
+
+def write_level(data: bytearray, level: game_engine.Level, offsetx: int, offsety: int) -> None:
+    snake_x, snake_y = level.snake.blocks[0] if level.snake else (0, 0)
+    data += LEVEL.pack(level.width, level.height, offsetx, offsety, level.snake is not None, snake_x, snake_y)
+
+    # Interaction groups reference static entities by their index
+    data += COUNT.pack(len(level.static))
+    for entity in level.static:
+        data += ENTITY.pack(get_entity_types()[type(entity)], entity.x, entity.y, entity.width, entity.height)
+
+    compiled = level.compiled_static or game_engine.compile_static(level.static)
+    data += GRID.pack(compiled.x, compiled.y, compiled.width, compiled.height)
+    data += compiled.grid
+
+    data += COUNT.pack(len(compiled.groups))
+    for group_type, entity_indexes, positions in compiled.groups:
+        data += GROUP.pack(get_group_types()[group_type], len(entity_indexes), len(positions))
+        data += array.array("I", entity_indexes).tobytes()
+        data += array.array("i", [coordinate for position in positions for coordinate in position]).tobytes()
+
+
+def read_level(data, offset: int) -> tuple[game_engine.Level, int, int]:
+    width, height, offsetx, offsety, has_snake, snake_x, snake_y = LEVEL.unpack_from(data, offset)
+    offset += LEVEL.size
+
+    snake = None
+    if has_snake:
+        snake = game_engine.entities.Snake([
+            (snake_x, snake_y),
+            (snake_x, snake_y + 1),
+            (snake_x + 1, snake_y + 1),
+            (snake_x + 1, snake_y)
+        ])
+
+    (entity_count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    entities = []
+    for entity_type, x, y, entity_width, entity_height in ENTITY.iter_unpack(data[offset:offset + entity_count*ENTITY.size]):
+        if entity_type == get_entity_types()[game_engine.entities.Wall]:
+            entities.append(game_engine.entities.Wall(x, y, entity_width, entity_height))
+        elif entity_type == get_entity_types()[game_engine.entities.Food]:
+            entities.append(game_engine.entities.Food(x, y))
+        elif entity_type == get_entity_types()[game_engine.entities.Finish]:
+            entities.append(game_engine.entities.Finish(x, y))
+        else:
+            raise ValueError(f"Unknown entity type {entity_type}")
+    offset += entity_count*ENTITY.size
+
+    grid_x, grid_y, grid_width, grid_height = GRID.unpack_from(data, offset)
+    offset += GRID.size
+    grid = bytearray(data[offset:offset + grid_width*grid_height])
+    offset += grid_width*grid_height
+
+    group_types = {value: key for key, value in get_group_types().items()}
+    (group_count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    groups = []
+    for _ in range(group_count):
+        group_type, entity_count, position_count = GROUP.unpack_from(data, offset)
+        offset += GROUP.size
+
+        entity_indexes = array.array("I")
+        entity_indexes.frombytes(data[offset:offset + entity_count*entity_indexes.itemsize])
+        offset += entity_count*entity_indexes.itemsize
+
+        coordinates = array.array("i")
+        coordinates.frombytes(data[offset:offset + 2*position_count*coordinates.itemsize])
+        offset += 2*position_count*coordinates.itemsize
+
+        positions = list(zip(coordinates[::2], coordinates[1::2]))
+        groups.append((group_types[group_type], entity_indexes.tolist(), positions))
+
+    level = game_engine.Level(width, height, snake, entities)
+    level.compiled_static = game_engine.CompiledStatic(grid_x, grid_y, grid_width, grid_height, grid, groups)
+    return level, offsetx, offsety
@@ -0,0 +1,80 @@
+import collections
+import time
+
+import utils
+
+# Where the time of one frame goes:
+#  input - taking key presses from the queue
+#  process_frame - simulation of the scenes (without the AI)
+#  ai - the AI looking for the next move
+#  display_frame - scenes drawing on the canvas
+#  update - tkinter showing the canvas on the screen
+#  slack - how much later than scheduled the frame started
+PHASES = ("input", "process_frame", "ai", "display_frame", "update", "slack")
+
+# How many of the last frames the percentiles are calculated from
+WINDOW_SIZE = 600
+
+
+# Measures how long each phase of a frame takes, keeps the last frames for percentiles
+#  and optionally writes every frame into a CSV file
+class FrameTimer:
+    def __init__(self, log_path: str | None = None):
+        self.samples: dict[str, collections.deque[float]] = {
+            phase: collections.deque(maxlen=WINDOW_SIZE) for phase in PHASES
+        }
+
+        # Phase times of the current frame
+        self.current: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        # Phases being measured right now, inner phases are not counted towards the outer ones
+        self.running: list[tuple[str, float]] = []
+
+        self.frame_number = 0
+        self.start_time = time.perf_counter()
+
+        self.log = None
+        if log_path:
+            self.log = open(log_path, "w")
+            self.log.write("frame,time," + ",".join(PHASES) + "\n")
+
+    def start_frame(self) -> None:
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def end_frame(self) -> None:
+        for phase in PHASES:
+            self.samples[phase].append(self.current[phase])
+
+        if self.log:
+            self.log.write(f"{self.frame_number},{(time.perf_counter() - self.start_time) * 1000:.3f},"
+                           + ",".join(f"{self.current[phase] * 1000:.3f}" for phase in PHASES) + "\n")
+        self.frame_number += 1
+
+    # with frame_timer.measure("phase"): ...
+    def measure(self, phase: str) -> "FrameTimer":
+        self.running.append((phase, time.perf_counter()))
+        return self
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *_) -> None:
+        phase, start = self.running.pop()
+        elapsed = time.perf_counter() - start
+        self.add(phase, elapsed)
+
+        # The outer phase does not include this one
+        if self.running:
+            self.add(self.running[-1][0], -elapsed)
+
+    # For time measured somewhere else
+    def add(self, phase: str, seconds: float) -> None:
+        self.current[phase] += seconds
+
+    # p50, p95 and p99 of the phase over the last frames (in seconds)
+    def get_percentiles(self, phase: str) -> list[float]:
+        return utils.percentiles(list(self.samples[phase]))
+
+    def close(self) -> None:
+        if self.log:
+            self.log.close()
+            self.log = None
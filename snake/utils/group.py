@@ -1,5 +1,6 @@
 from collections import deque
 
+import utils
 import game_engine
 
 
@@ -33,21 +34,31 @@ def get_connected_conductive_groups(entities: list[game_engine.entities.StaticEn
     # Only conductive entities are considered
     entities = [entity for entity in entities if entity.conductive]
 
+    # Index of the entity rectangles, so only entities touching each other get compared
+    index = utils.RectIndex([(rect, i) for i, entity in enumerate(entities) for rect in entity.get_collision_rects()])
+
+    # Indexes of entities that are not in any group yet
+    not_grouped = set(range(len(entities)))
+
     groups: list[list[game_engine.entities.StaticEntity]] = []
 
-    while entities:
+    for start in reversed(range(len(entities))):
+        if start not in not_grouped:
+            continue
+        not_grouped.remove(start)
+
         # Group of entities that are connected
         connected: list[game_engine.entities.StaticEntity] = []
         # Stack of entities not checked yet
-        not_checked: deque[game_engine.entities.StaticEntity] = deque([entities.pop()])
+        not_checked: deque[int] = deque([start])
 
         while not_checked:
             current = not_checked.pop()
 
-            for entity in pop_connected_entities(current, entities):
-                not_checked.append(entity)
+            for i in pop_connected_entities(entities, current, index, not_grouped):
+                not_checked.append(i)
 
-            connected.append(current)
+            connected.append(entities[current])
 
         groups.append(connected)
 
@@ -72,15 +83,12 @@ def pop_connected_blocks(current: tuple[int, int], blocks: list[tuple[int, int]]
 
 
 # Get connected groups is recursive, this is just a single iteration
-def pop_connected_entities(current: game_engine.entities.StaticEntity, entities: list[game_engine.entities.StaticEntity]):
-    connected: list[game_engine.entities.StaticEntity] = []
-    current_reach = set(current.get_electricity_coords())
-
-    for entity in entities:
-        # The entities are connected
-        if current_reach.intersection(set(entity.get_collision_coords())):
-            connected.append(entity)
-
-    # To not lose the reference
-    entities[:] = [entity for entity in entities if entity not in connected]
+#  returns indexes of the connected entities in their original order
+def pop_connected_entities(entities: list[game_engine.entities.StaticEntity], current: int,
+                           index: utils.RectIndex, not_grouped: set[int]) -> list[int]:
+    # The entities are connected when their collision rectangles overlap the reach of the current entity
+    connected = sorted({i for reach in entities[current].get_electricity_rects()
+                        for _, i in index.query_rect(*reach) if i in not_grouped})
+
+    not_grouped.difference_update(connected)
     return connected
@@ -0,0 +1,185 @@
+import random
+import typing
+
+import game_engine
+
+# Layouts of the generated levels:
+#  terrain - columns of walls standing on the ground, the snake climbs them like stairs
+#  ledges - the same terrain with floating platforms above some of the columns
+LAYOUTS = ("terrain", "ledges")
+# Where the finish goes - on the last column, on a random column or on the highest column
+FINISH_PLACEMENTS = ("end", "random", "highest")
+
+# The snake starts on the ground at the left side of the level, this many blocks of it are kept flat
+START_WIDTH = 5
+# Columns are this wide (the last one can be wider so that it fits the finish)
+MIN_COLUMN_WIDTH = 2
+MAX_COLUMN_WIDTH = 6
+# Neighboring columns differ in height by at most this much, otherwise the snake could not climb them
+MAX_STEP = 2
+# Size of game_engine.entities.Finish
+FINISH_WIDTH = 4
+FINISH_HEIGHT = 3
+# Floating platforms are this high above the column under them
+MIN_LEDGE_GAP = 3
+MAX_LEDGE_GAP = 4
+# How many of the columns get a floating platform in the ledges layout
+LEDGE_CHANCE = 0.3
+
+
+# How many seeds get tried for one level before giving up on finding a solvable one
+MAX_ATTEMPTS = 100
+
+
+# Everything the generated level depends on (together with the seed)
+class LevelParameters:
+    def __init__(self, width: int, height: int, wall_density: float = 0.2, layout: str = "terrain",
+                 food_count: int = 5, finish: str = "end"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout}, choose from {', '.join(LAYOUTS)}")
+        if finish not in FINISH_PLACEMENTS:
+            raise ValueError(f"Unknown finish placement {finish}, choose from {', '.join(FINISH_PLACEMENTS)}")
+        if width < START_WIDTH + 2*FINISH_WIDTH or height < 12:
+            raise ValueError(f"Level {width}x{height} is too small")
+
+        self.width = width
+        self.height = height
+        # Part of the level above the ground covered by walls
+        self.wall_density = wall_density
+        self.layout = layout
+        self.food_count = food_count
+        self.finish = finish
+
+
+# Generates a random level, the same parameters and seed always give the same level
+#  returns the level and the starting camera offset (like utils.load_level)
+#  the level is not guaranteed to be solvable, check it with the AI (ai.solve_level)
+def generate_level(parameters: LevelParameters, seed: int) -> tuple[game_engine.Level, int, int]:
+    rng = random.Random(seed)
+    width, height = parameters.width, parameters.height
+
+    # The ground is the bottom two rows, everything stands on it
+    ground_y = height - 1
+    # The highest column leaves some room above it for the snake
+    max_column_height = height - 8
+    target_height = min(parameters.wall_density*(height - 2), max_column_height)
+
+    # Columns of the terrain - [x, width, height], the first one is where the snake starts
+    columns = [[1, START_WIDTH, 0]]
+    x = 1 + START_WIDTH
+    column_height = 0
+    while x <= width:
+        # The last column takes the rest of the level so that the finish fits on it
+        remaining = width - x + 1
+        if remaining <= MAX_COLUMN_WIDTH + FINISH_WIDTH:
+            column_width = remaining
+        else:
+            column_width = rng.randint(MIN_COLUMN_WIDTH, min(MAX_COLUMN_WIDTH, remaining - FINISH_WIDTH))
+
+        # Random walk around the target height, steps away from it get rolled again
+        step = rng.randint(-MAX_STEP, MAX_STEP)
+        if column_height < target_height and step < 0 or column_height > target_height and step > 0:
+            step = rng.randint(-MAX_STEP, MAX_STEP)
+        column_height = max(0, min(max_column_height, column_height + step))
+
+        columns.append([x, column_width, column_height])
+        x += column_width
+
+    # The finish replaces the top of a column that is wide enough
+    finish_columns = [column for column in columns[1:] if column[1] >= FINISH_WIDTH]
+    if parameters.finish == "end":
+        finish_column = finish_columns[-1]
+    elif parameters.finish == "random":
+        finish_column = rng.choice(finish_columns)
+    else:
+        finish_column = max(finish_columns, key=lambda column: column[2])
+    finish_column[2] = max(finish_column[2], FINISH_HEIGHT)
+
+    entities: list[game_engine.entities.Entity] = [game_engine.entities.Wall(1, ground_y, width, 2)]
+    # Positions the snake can stand on, food goes on some of them
+    surface: list[tuple[int, int]] = []
+
+    for column in columns:
+        x, column_width, column_height = column
+        top = ground_y - column_height
+
+        if column is finish_column:
+            entities.append(game_engine.entities.Finish(x, top))
+            if column_height > FINISH_HEIGHT:
+                entities.append(game_engine.entities.Wall(x, top + FINISH_HEIGHT, FINISH_WIDTH,
+                                                          column_height - FINISH_HEIGHT))
+            if column_width > FINISH_WIDTH:
+                entities.append(game_engine.entities.Wall(x + FINISH_WIDTH, top, column_width - FINISH_WIDTH,
+                                                          column_height))
+                surface.extend((x + dx, top - 1) for dx in range(FINISH_WIDTH, column_width))
+            continue
+
+        if column_height:
+            entities.append(game_engine.entities.Wall(x, top, column_width, column_height))
+        if column is not columns[0]:
+            surface.extend((x + dx, top - 1) for dx in range(column_width))
+
+        # Floating platform above the column
+        if parameters.layout == "ledges" and column is not columns[0] and rng.random() < LEDGE_CHANCE:
+            ledge_y = top - rng.randint(MIN_LEDGE_GAP, MAX_LEDGE_GAP) - 1
+            if ledge_y > 2:
+                entities.append(game_engine.entities.Wall(x, ledge_y, column_width, 1))
+                surface.extend((x + dx, ledge_y - 1) for dx in range(column_width))
+
+    for x, y in rng.sample(surface, min(parameters.food_count, len(surface))):
+        entities.append(game_engine.entities.Food(x, y))
+
+    snake = game_engine.entities.Snake([(2, ground_y - 2), (2, ground_y - 1), (3, ground_y - 1), (3, ground_y - 2)])
+
+    # The camera starts in the bottom left corner (17 blocks fit on the screen)
+    return game_engine.Level(width, height, snake, entities), -1, min(-1, 16 - height)
+
+
+# Reproducible sets of levels for benchmarks and profiling - parameters and how many levels the corpus has
+#  huge levels are tall instead of wide, the AI gets lost on long paths but the static engine has to handle the area
+CORPORA: dict[str, tuple[LevelParameters, int]] = {
+    "small": (LevelParameters(32, 24, 0.2, "terrain", 4, "end"), 8),
+    "medium": (LevelParameters(128, 48, 0.25, "ledges", 8, "random"), 6),
+    "huge": (LevelParameters(256, 1100, 0.02, "terrain", 5, "end"), 2),
+}
+
+
+# Generates the level with the first seed (starting from the given one) for which it is solvable
+#  returns the level, the starting camera offset and the seed
+def generate_solvable_level(parameters: LevelParameters, seed: int,
+                            is_solvable: typing.Callable[[game_engine.Level], bool]) \
+        -> tuple[game_engine.Level, int, int, int]:
+    for level_seed in range(seed, seed + MAX_ATTEMPTS):
+        level, offsetx, offsety = generate_level(parameters, level_seed)
+        if is_solvable(level):
+            return level, offsetx, offsety, level_seed
+
+    raise RuntimeError(f"No solvable level found for seeds {seed} to {seed + MAX_ATTEMPTS - 1}")
+
+
+# Generates the levels of a corpus, every level uses the next solvable seed after the previous level
+def generate_corpus(name: str, seed: int, is_solvable: typing.Callable[[game_engine.Level], bool]) \
+        -> list[tuple[game_engine.Level, int, int, int]]:
+    parameters, count = CORPORA[name]
+
+    levels = []
+    for _ in range(count):
+        levels.append(generate_solvable_level(parameters, seed, is_solvable))
+        seed = levels[-1][3] + 1
+    return levels
+
+
+# Writes the level in the .hadik format (the snake is saved by its first block like in the level files)
+def save_level(path: str, level: game_engine.Level, offsetx: int, offsety: int) -> None:
+    walls = [entity for entity in level.static if isinstance(entity, game_engine.entities.Wall)]
+    food = [entity for entity in level.static if isinstance(entity, game_engine.entities.Food)]
+    finish = next(entity for entity in level.static if isinstance(entity, game_engine.entities.Finish))
+    snake_x, snake_y = level.snake.blocks[0]
+
+    with open(path, "w") as f:
+        f.write(f"DIMENSIONS\n{level.width};{level.height}\n\n")
+        f.write(f"CAMERA_OFFSET\n{offsetx};{offsety}\n\n")
+        f.write(f"SNAKE\n{snake_x};{snake_y}\n\n")
+        f.write("WALL\n" + "".join(f"{wall.x};{wall.y};{wall.width};{wall.height}\n" for wall in walls) + "\n")
+        f.write("FOOD\n" + "".join(f"{entity.x};{entity.y}\n" for entity in food) + "\n")
+        f.write(f"FINISH\n{finish.x};{finish.y}\n")
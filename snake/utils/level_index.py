@@ -0,0 +1,116 @@
+import os
+import re
+
+import utils
+import game_engine
+
+# Levels are "<number>.hadik" files in the resources directory
+LEVEL_FILE = re.compile(r"^(\d+)\.hadik$")
+INDEX_FILE = "levels.index"
+# Number of values on every line of the index (the arguments of LevelInfo)
+INDEX_FIELDS = 7
+
+
+# What menus need to know about a level without loading it
+class LevelInfo:
+    def __init__(self, number: int, file_size: int, mtime: int, width: int, height: int,
+                 food_count: int, wall_count: int):
+        self.number = number
+
+        # To know when the level file changed and the info has to be read again
+        self.file_size = file_size
+        self.mtime = mtime
+
+        self.width = width
+        self.height = height
+        self.food_count = food_count
+        self.wall_count = wall_count
+
+
+# Info about all levels in the resources directory, saved in an index file so the levels do not have to be
+#  loaded every time the application starts, levels that changed since the last time get loaded again
+class LevelIndex:
+    def __init__(self):
+        self.levels: dict[int, LevelInfo] = {}
+
+    def load(self) -> None:
+        resources_path = utils.get_resources_path()
+        index_path = f"{resources_path}/{INDEX_FILE}"
+
+        saved: dict[int, LevelInfo] = {}
+        if os.path.exists(index_path):
+            try:
+                saved = read_index(index_path)
+            except (OSError, ValueError):
+                saved = {}
+
+        self.levels = {}
+        for file_name in os.listdir(resources_path):
+            match = LEVEL_FILE.match(file_name)
+            if not match:
+                continue
+
+            number = int(match.group(1))
+            stat = os.stat(f"{resources_path}/{file_name}")
+            info = saved.get(number)
+            if info is None or info.file_size != stat.st_size or info.mtime != stat.st_mtime_ns:
+                info = create_level_info(number, stat.st_size, stat.st_mtime_ns)
+            self.levels[number] = info
+
+        # Saves the index only when something changed
+        if self.levels.keys() != saved.keys() or any(self.levels[number] is not saved[number] for number in saved):
+            write_index(index_path, self.levels)
+
+    def has_level(self, number: int) -> bool:
+        return number in self.levels
+
+    def get(self, number: int) -> LevelInfo | None:
+        return self.levels.get(number)
+
+
+def create_level_info(number: int, file_size: int, mtime: int) -> LevelInfo:
+    level, _, _ = utils.load_level(number)
+    food_count = sum(isinstance(entity, game_engine.entities.Food) for entity in level.static)
+    wall_count = sum(isinstance(entity, game_engine.entities.Wall) for entity in level.static)
+    return LevelInfo(number, file_size, mtime, level.width, level.height, food_count, wall_count)
+
+
+# LEVELS section with one line per level - number;file size;modification time (ns);width;height;food;walls
+def read_index(index_path: str) -> dict[int, LevelInfo]:
+    levels: dict[int, LevelInfo] = {}
+
+    with open(index_path, "r") as f:
+        line = f.readline()
+        while line:
+
+            if "LEVELS" in line:
+                line = f.readline()
+
+                while ";" in line:
+                    fields = line.strip().split(";")
+                    if len(fields) != INDEX_FIELDS:
+                        raise ValueError(f"Broken line in the level index: {line.strip()}")
+                    info = LevelInfo(*[int(x) for x in fields])
+                    levels[info.number] = info
+
+                    line = f.readline()
+                continue
+
+            line = f.readline()
+
+    return levels
+
+
+# Does nothing if the index can not be saved, it just gets created again next time
+def write_index(index_path: str, levels: dict[int, LevelInfo]) -> None:
+    try:
+        with open(index_path + ".tmp", "w") as f:
+            f.write("LEVELS" + "\n")
+            for number in sorted(levels):
+                info = levels[number]
+                f.write(";".join(str(x) for x in (info.number, info.file_size, info.mtime, info.width, info.height,
+                                                  info.food_count, info.wall_count)) + "\n")
+            f.write("\n")
+        os.replace(index_path + ".tmp", index_path)
+    except OSError:
+        pass
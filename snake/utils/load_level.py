@@ -1,22 +1,46 @@
+import re
 from os import path
 
 import utils
 import game_engine
 
+# One run of tiles in a TILES row - optional count and the tile ("." empty, "#" wall, "*" food)
+TILE_RUN = re.compile(r"(\d*)([.#*])")
+# A whole row is only runs of tiles
+TILE_ROW = re.compile(r"(\d*[.#*])*")
+
 
 #  Returns the level info and the starting camera offset
 def load_level(level_number) -> tuple[game_engine.Level, int, int]:
-    level_width, level_height = 0, 0
-    offsetx, offsety = 0, 0
-    snake = None
-    entities = []
-
     level_path = f"{utils.get_resources_path()}/{level_number}.hadik"
 
     # TODO implement all levels
     if not path.exists(level_path):
         raise NotImplementedError(f"Level {level_number} not implemented")
 
+    # Loads the already preprocessed level if it is up to date
+    compiled = utils.load_compiled_level(level_path)
+    if compiled is not None:
+        return compiled
+
+    level, offsetx, offsety = parse_level(level_path)
+
+    # Preprocesses the level once and saves it for next time
+    #  levels that are too big get preprocessed chunk by chunk while playing instead
+    if level.width*level.height <= game_engine.CHUNKED_LEVEL_AREA:
+        level.compiled_static = game_engine.compile_static(level.static)
+        utils.save_compiled_level(level_path, level, offsetx, offsety)
+
+    return level, offsetx, offsety
+
+
+#  Parses the level from the .hadik text format
+def parse_level(level_path: str) -> tuple[game_engine.Level, int, int]:
+    level_width, level_height = 0, 0
+    offsetx, offsety = 0, 0
+    snake = None
+    entities = []
+
     with open(level_path, "r") as f:
         line = f.readline()
         while line:
@@ -57,6 +81,19 @@ def load_level(level_number) -> tuple[game_engine.Level, int, int]:
                     line = f.readline()
                 continue
 
+            elif "TILES" in line:
+                origin_x, origin_y = ([int(x) for x in f.readline().strip().split(";")])
+
+                # Rows continue until an empty line
+                rows = []
+                line = f.readline()
+                while line.strip():
+                    rows.append(line.strip())
+                    line = f.readline()
+
+                entities.extend(decode_tiles(origin_x, origin_y, rows))
+                continue
+
             elif "FINISH" in line:
                 x, y = ([int(x) for x in f.readline().strip().split(";")])
                 entities.append(game_engine.entities.Finish(x, y))
@@ -64,3 +101,49 @@ def load_level(level_number) -> tuple[game_engine.Level, int, int]:
             line = f.readline()
 
     return game_engine.Level(level_width, level_height, snake, entities), offsetx, offsety
+
+
+# Decodes run-length encoded rows of tiles (like "3.12#2*") with the top left tile at the origin
+#  walls in consecutive rows with the same start and end get merged into one rectangle
+def decode_tiles(origin_x: int, origin_y: int, rows: list[str]) -> list[game_engine.entities.StaticEntity]:
+    walls: list[game_engine.entities.StaticEntity] = []
+    food: list[game_engine.entities.StaticEntity] = []
+    # Walls that can still grow downwards - (start x, end x): start y
+    open_walls: dict[tuple[int, int], int] = {}
+
+    for dy, row in enumerate(rows):
+        y = origin_y + dy
+        x = origin_x
+        row_walls: list[tuple[int, int]] = []
+
+        # Anything else in the row would shift all tiles after it
+        if not TILE_ROW.fullmatch(row):
+            raise ValueError(f"Broken TILES row {dy + 1}: {row}")
+
+        for match in TILE_RUN.finditer(row):
+            count = int(match.group(1)) if match.group(1) else 1
+            tile = match.group(2)
+
+            if tile == "#":
+                # Joins with the wall run right before it (like "2#3#")
+                if row_walls and row_walls[-1][1] == x:
+                    row_walls[-1] = (row_walls[-1][0], x + count)
+                else:
+                    row_walls.append((x, x + count))
+            elif tile == "*":
+                food.extend(game_engine.entities.Food(x + dx, y) for dx in range(count))
+            x += count
+
+        # Walls that do not continue in this row are finished
+        for (start_x, end_x), start_y in list(open_walls.items()):
+            if (start_x, end_x) not in row_walls:
+                walls.append(game_engine.entities.Wall(start_x, start_y, end_x - start_x, y - start_y))
+                del open_walls[start_x, end_x]
+
+        for row_wall in row_walls:
+            open_walls.setdefault(row_wall, y)
+
+    for (start_x, end_x), start_y in open_walls.items():
+        walls.append(game_engine.entities.Wall(start_x, start_y, end_x - start_x, origin_y + len(rows) - start_y))
+
+    return walls + food
@@ -14,39 +14,60 @@ class PlayerData:
         self.fullscreen = DEFAULT_FULLSCREEN
         self.autoplay = DEFAULT_AUTOPLAY
 
+        # Saving happens in the background, so it never slows down a frame
+        self.save_file: utils.WriteBehindFile | None = None
+
     def load(self):
         save_path = f"{utils.get_resources_path()}/player_data.save"
 
         # A save does not exist, use default
         if not path.exists(save_path):
-            self.levels = [None] + [False for _ in range(16)]
-            self.fullscreen = DEFAULT_FULLSCREEN
-            self.autoplay = DEFAULT_AUTOPLAY
+            self.set_defaults()
+            return
 
-        with open(save_path, "r") as f:
-            line = f.readline()
-            while line:
+        try:
+            with open(save_path, "r") as f:
+                line = f.readline()
+                while line:
 
-                if "FULLSCREEN" in line:
-                    self.fullscreen = True if f.readline().strip() == "True" else False
+                    if "FULLSCREEN" in line:
+                        self.fullscreen = True if f.readline().strip() == "True" else False
 
-                elif "AUTOPLAY" in line:
-                    self.autoplay = True if f.readline().strip() == "True" else False
+                    elif "AUTOPLAY" in line:
+                        self.autoplay = True if f.readline().strip() == "True" else False
 
-                elif "LEVELS" in line:
-                    for level in f.readline().strip().split(";"):
-                        if level:
-                            self.levels[int(level)] = True
+                    elif "LEVELS" in line:
+                        for level in f.readline().strip().split(";"):
+                            if level:
+                                self.levels[int(level)] = True
 
-                line = f.readline()
+                    line = f.readline()
+
+        # The save is broken, use default
+        except (OSError, ValueError, IndexError):
+            self.set_defaults()
+
+    def set_defaults(self):
+        self.levels = [None] + [False for _ in range(16)]
+        self.fullscreen = DEFAULT_FULLSCREEN
+        self.autoplay = DEFAULT_AUTOPLAY
 
+    # Only prepares the content, it gets written in the background (rapid saves get written once)
     def save(self):
         levels = [str(i) for i in range(17) if self.levels[i] and i != 0]
 
-        with open(f"{utils.get_resources_path()}/player_data.save", "w") as f:
-            f.write("FULLSCREEN" + "\n")
-            f.write(("True" if self.fullscreen else "False") + "\n\n")
-            f.write("AUTOPLAY" + "\n")
-            f.write(("True" if self.autoplay else "False") + "\n\n")
-            f.write("LEVELS" + "\n")
-            f.write(";".join([str(level) for level in levels]) + "\n\n")
+        content = "FULLSCREEN" + "\n" \
+            + ("True" if self.fullscreen else "False") + "\n\n" \
+            + "AUTOPLAY" + "\n" \
+            + ("True" if self.autoplay else "False") + "\n\n" \
+            + "LEVELS" + "\n" \
+            + ";".join([str(level) for level in levels]) + "\n\n"
+
+        if self.save_file is None:
+            self.save_file = utils.WriteBehindFile(f"{utils.get_resources_path()}/player_data.save")
+        self.save_file.write(content)
+
+    # Waits for the last save to be written, call before exiting the application
+    def close(self):
+        if self.save_file is not None:
+            self.save_file.close()
@@ -0,0 +1,115 @@
+import collections
+import contextlib
+import cProfile
+import os
+import sys
+import threading
+import time
+
+# How often the sampling thread looks at what the main thread is doing (in seconds)
+SAMPLE_INTERVAL = 0.001
+# Threads switch this often while capturing (in seconds), by default a frame can be over
+#  before the sampling thread gets a chance to run
+CAPTURE_SWITCH_INTERVAL = 0.0005
+
+
+# Profiles the application while capturing, separately for every scene type
+#  cProfile measures every call, the sampling thread periodically records the stack of the main thread
+#  when the capture stops, the results are written as pstats and as collapsed stacks (for flamegraphs)
+class Profiler:
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.capturing = False
+        self.capture_number = 0
+
+        # Results of the current capture by scene type
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.stacks: dict[str, collections.Counter[str]] = {}
+
+        # What is being profiled right now, only the outermost profile() counts
+        self.current_scene: str | None = None
+        self.depth = 0
+
+        self.main_thread_id = threading.get_ident()
+        self.sampling_thread: threading.Thread | None = None
+        self.switch_interval = sys.getswitchinterval()
+
+    def toggle(self) -> None:
+        if self.capturing:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self) -> None:
+        self.capturing = True
+        self.capture_number += 1
+        self.profiles = {}
+        self.stacks = {}
+
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(CAPTURE_SWITCH_INTERVAL)
+        self.sampling_thread = threading.Thread(target=self.sample, name="profiler", daemon=True)
+        self.sampling_thread.start()
+        print(f"Profiling capture {self.capture_number} started")
+
+    def stop(self) -> None:
+        if not self.capturing:
+            return
+        self.capturing = False
+        self.sampling_thread.join()
+        sys.setswitchinterval(self.switch_interval)
+        self.write_results()
+
+    # with profiler.profile("Game"): ... - profiles the code under the scene type while capturing
+    @contextlib.contextmanager
+    def profile(self, scene: str):
+        # Only one profile can be running, nested code (like resizing during a frame) counts towards the outer one
+        if not self.capturing or self.depth:
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+            return
+
+        profile = self.profiles.setdefault(scene, cProfile.Profile())
+        self.current_scene = scene
+        self.depth += 1
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.depth -= 1
+            self.current_scene = None
+
+    def sample(self) -> None:
+        while self.capturing:
+            time.sleep(SAMPLE_INTERVAL)
+
+            scene = self.current_scene
+            frame = sys._current_frames().get(self.main_thread_id)
+            # The main thread is waiting for tkinter between frames
+            if scene is None or frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks.setdefault(scene, collections.Counter())[";".join(reversed(stack))] += 1
+
+    def write_results(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        for scene, profile in self.profiles.items():
+            profile.dump_stats(f"{self.output_dir}/{self.capture_number}-{scene}.pstats")
+
+        for scene, stacks in self.stacks.items():
+            with open(f"{self.output_dir}/{self.capture_number}-{scene}.collapsed", "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        print(f"Profiling capture {self.capture_number} saved to {self.output_dir} "
+              f"({', '.join(sorted(self.profiles)) or 'nothing profiled'})")
@@ -0,0 +1,65 @@
+import math
+import typing
+
+# How many rectangles (or child nodes) fit in one node of the tree
+NODE_CAPACITY = 16
+
+
+# Static R-tree over (x, y, width, height) rectangles, each with a value attached
+#  built all at once by sorting the rectangles into tiles (Sort-Tile-Recursive), so nodes barely overlap
+#  nodes are (min x, min y, max x, max y, children) with exclusive max, leaf children are (rect, value)
+class RectIndex:
+    def __init__(self, items: list[tuple[tuple[int, int, int, int], typing.Any]]):
+        entries = [(x, y, x + width, y + height, (rect, value))
+                   for rect, value in items for x, y, width, height in [rect] if width > 0 and height > 0]
+        self.size = len(entries)
+
+        # Builds the tree level by level until only the root is left, the depth is where the leaves are
+        nodes = pack(entries)
+        self._depth = 0
+        while len(nodes) > 1:
+            nodes = pack(nodes)
+            self._depth += 1
+        self._root = nodes[0] if nodes else None
+
+    # Values of all rectangles that contain the position
+    def query_point(self, x: int, y: int) -> list[typing.Any]:
+        return [value for _, value in self.query_rect(x, y, 1, 1)]
+
+    # All (rect, value) items whose rectangles overlap the area
+    def query_rect(self, x: int, y: int, width: int, height: int) -> list[tuple[tuple[int, int, int, int], typing.Any]]:
+        if self._root is None:
+            return []
+
+        found = []
+        right, bottom = x + width, y + height
+        # Stack of (node, depth)
+        not_checked = [(self._root, 0)]
+        while not_checked:
+            node, depth = not_checked.pop()
+            for child in node[4]:
+                if child[0] < right and x < child[2] and child[1] < bottom and y < child[3]:
+                    if depth == self._depth:
+                        found.append(child[4])
+                    else:
+                        not_checked.append((child, depth + 1))
+        return found
+
+
+# Groups the entries into nodes - sorted into vertical slices by x, then each slice into nodes by y
+def pack(entries: list[tuple]) -> list[tuple]:
+    if not entries:
+        return []
+
+    node_count = math.ceil(len(entries) / NODE_CAPACITY)
+    slice_size = math.ceil(math.sqrt(node_count))*NODE_CAPACITY
+
+    nodes = []
+    entries = sorted(entries, key=lambda entry: entry[0] + entry[2])
+    for i in range(0, len(entries), slice_size):
+        vertical_slice = sorted(entries[i:i + slice_size], key=lambda entry: entry[1] + entry[3])
+        for j in range(0, len(vertical_slice), NODE_CAPACITY):
+            children = vertical_slice[j:j + NODE_CAPACITY]
+            nodes.append((min(child[0] for child in children), min(child[1] for child in children),
+                          max(child[2] for child in children), max(child[3] for child in children), children))
+    return nodes
@@ -0,0 +1,10 @@
+import math
+
+
+# Returns the given percentiles (0-100) of the samples using the nearest-rank method
+def percentiles(samples: list[float], ranks: tuple[float, ...] = (50, 95, 99)) -> list[float]:
+    if not samples:
+        return [0.0 for _ in ranks]
+
+    ordered = sorted(samples)
+    return [ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)] for rank in ranks]
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+# How long to wait for more writes before writing the file, rapid writes end up as one
+WRITE_DELAY = 0.2
+
+
+# Writes a file in a background thread, so whoever writes it never has to wait for the disk
+#  only the newest content gets written, it is written to a temporary file first and then renamed
+#  so the file is never left half written
+class WriteBehindFile:
+    def __init__(self, path: str):
+        self.path = path
+
+        # Newest content that was not written yet
+        self.pending: str | None = None
+        self.writing = False
+        # Threads waiting in flush, the content is written right away for them
+        self.flushing = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+        self.thread: threading.Thread | None = None
+
+    def write(self, content: str) -> None:
+        with self.condition:
+            self.pending = content
+            self.condition.notify_all()
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="write-behind", daemon=True)
+                self.thread.start()
+
+    # Waits until everything written so far is on the disk
+    def flush(self) -> None:
+        with self.condition:
+            self.flushing += 1
+            self.condition.notify_all()
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+            self.flushing -= 1
+
+    def close(self) -> None:
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+
+                # Gives rapid writes a chance to replace the content
+                deadline = time.monotonic() + WRITE_DELAY
+                while not self.flushing and time.monotonic() < deadline:
+                    self.condition.wait(deadline - time.monotonic())
+
+                content = self.pending
+                self.pending = None
+                self.writing = True
+
+            try:
+                with open(self.path + ".tmp", "w") as f:
+                    f.write(content)
+                os.replace(self.path + ".tmp", self.path)
+            except OSError:
+                pass
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()